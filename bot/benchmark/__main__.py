@@ -0,0 +1,10 @@
+import os
+
+os.environ.setdefault('API_ID', '0')
+os.environ.setdefault('API_HASH', 'benchmark')
+
+from bot.benchmark.bench import main
+
+
+if __name__ == '__main__':
+    main()
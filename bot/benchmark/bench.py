@@ -0,0 +1,188 @@
+import sys
+import socket
+import asyncio
+import argparse
+import resource
+import multiprocessing
+from time import time, perf_counter
+from types import SimpleNamespace
+from statistics import quantiles
+from contextlib import suppress
+
+import aiohttp
+from pyrogram.raw.types import InputPeerUser
+
+from bot.config import settings
+from bot.utils import logger
+from bot.utils.launcher import run_tasks
+from bot.core.http_pool import http_pool
+from .server import run_server
+
+
+class FakeClient:
+    def __init__(self, name: str):
+        self.name = name
+        self.proxy = None
+        self.is_connected = False
+
+    async def connect(self) -> None:
+        self.is_connected = True
+
+    async def disconnect(self) -> None:
+        self.is_connected = False
+
+    async def resolve_peer(self, peer_id: str) -> InputPeerUser:
+        return InputPeerUser(user_id=1, access_hash=1)
+
+    async def invoke(self, query) -> SimpleNamespace:
+        return SimpleNamespace(url=f'https://clicker.wormfare.com/#tgWebAppData=user%3D{self.name}'
+                                   f'%26auth_date%3D{int(time())}&tgWebAppVersion=7.0')
+
+
+class RequestStats:
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.statuses: dict[int, int] = {}
+        self.errors = 0
+
+    def create_trace_config(self) -> aiohttp.TraceConfig:
+        async def on_request_start(session, context, params):
+            context.started_at = perf_counter()
+
+        async def on_request_end(session, context, params):
+            self.latencies.append(perf_counter() - context.started_at)
+            self.statuses[params.response.status] = self.statuses.get(params.response.status, 0) + 1
+
+        async def on_request_exception(session, context, params):
+            self.errors += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+
+        return trace_config
+
+
+def get_rss() -> int:
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0
+
+    return quantiles(values, n=100, method='inclusive')[percent - 1]
+
+
+async def sample_loop_lag(lags: list[float], interval: float = 0.1) -> None:
+    while True:
+        started_at = perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(max(perf_counter() - started_at - interval, 0))
+
+
+async def wait_for_server(port: int, timeout: float = 10) -> None:
+    deadline = time() + timeout
+
+    while time() < deadline:
+        with suppress(OSError):
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            return
+
+        await asyncio.sleep(0.1)
+
+    raise TimeoutError("Mock server did not start")
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    port = get_free_port()
+    server = multiprocessing.get_context('spawn').Process(
+        target=run_server, daemon=True,
+        args=('127.0.0.1', port, args.latency, args.error_rate, args.rate_limit_rate, args.token_ttl, args.max_rps,
+              args.energy_stats))
+    server.start()
+
+    settings.API_URL = f'http://127.0.0.1:{port}'
+    settings.ENGINE = args.engine
+    settings.USE_AUTH_CACHE = False
+    settings.USE_STATS_STORE = False
+    settings.CONFIG_RELOAD_INTERVAL = 0
+    settings.AUTH_RAMP_WINDOW = args.ramp
+    settings.SLEEP_BETWEEN_SLAP = [args.sleep, args.sleep]
+    settings.SLEEP_JITTER = [0, 0]
+
+    request_stats = RequestStats()
+    http_pool.trace_configs.append(request_stats.create_trace_config())
+
+    lags: list[float] = []
+    lag_task = asyncio.create_task(sample_loop_lag(lags=lags))
+
+    try:
+        await wait_for_server(port=port)
+
+        rss_before = get_rss()
+        tg_clients = [FakeClient(name=f'bench_{index}') for index in range(args.accounts)]
+
+        started_at = perf_counter()
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                run_tasks(tg_clients=tg_clients, proxy_assignments={tg_client.name: None for tg_client in tg_clients},
+                          profile_duration=args.profile),
+                timeout=args.duration)
+        elapsed = perf_counter() - started_at
+
+        rss_per_account = (get_rss() - rss_before) / args.accounts
+    finally:
+        lag_task.cancel()
+        await http_pool.close()
+        server.terminate()
+
+    latencies = request_stats.latencies
+    statuses = ', '.join(f'{status}: {count}' for status, count in sorted(request_stats.statuses.items()))
+
+    print(f"Accounts:        {args.accounts} ({args.engine} engine)")
+    print(f"Duration:        {elapsed:.1f}s")
+    print(f"Requests:        {len(latencies)} ({len(latencies) / elapsed:.1f} req/s) | {statuses}")
+    print(f"Client errors:   {request_stats.errors}")
+    print(f"Latency:         p50 {percentile(latencies, 50) * 1000:.1f}ms | "
+          f"p99 {percentile(latencies, 99) * 1000:.1f}ms")
+    print(f"RSS per account: {rss_per_account / 1024:.1f} KiB")
+    print(f"Loop lag:        p50 {percentile(lags, 50) * 1000:.1f}ms | p99 {percentile(lags, 99) * 1000:.1f}ms | "
+          f"max {max(lags, default=0) * 1000:.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Run the clicker against a local mock API and report performance')
+    parser.add_argument('-n', '--accounts', type=int, default=100, help='Number of simulated accounts')
+    parser.add_argument('-d', '--duration', type=float, default=60, help='Benchmark duration in seconds')
+    parser.add_argument('--engine', choices=['tasks', 'scheduler'], default=settings.ENGINE)
+    parser.add_argument('--sleep', type=int, default=1, help='Delay between slaps in seconds')
+    parser.add_argument('--ramp', type=int, default=0, help='Authorization ramp window in seconds')
+    parser.add_argument('--latency', type=float, default=0.05, help='Mean mock API latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0, help='Share of requests answered with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0, help='Share of requests answered with 429')
+    parser.add_argument('--token-ttl', type=int, default=3600, help='Mock access token lifetime in seconds')
+    parser.add_argument('--max-rps', type=float, default=0, help='Mock API requests per second before answering 429')
+    parser.add_argument('--energy-stats', action='store_true',
+                        help='Send energyMax and energyPerSecond in the mock profile, the live API sends neither')
+    parser.add_argument('--profile', type=int, help='Profile the clicker for the given number of seconds')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Keep per-account logging')
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.remove()
+        logger.add(sink=sys.stderr, level='ERROR')
+
+    asyncio.run(run_benchmark(args=args))
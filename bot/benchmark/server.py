@@ -0,0 +1,254 @@
+import json
+import base64
+import asyncio
+import argparse
+from time import time, monotonic
+from random import random, uniform
+from urllib.parse import parse_qs
+
+from aiohttp import web
+
+
+BOOST_PRICES = {
+    'energy_per_tap': 2000,
+    'energy_max': 1500,
+    'energy_per_second': 5000,
+}
+DAILY_BOOSTS = 3
+TURBO_DURATION = 20
+
+
+class Player:
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+
+        self.score = 0
+        self.earned_today = 0
+        self.total_earned = 0
+
+        self.levels = {'energy_per_tap': 1, 'energy_max': 1, 'energy_per_second': 1}
+        self.daily_boosts = {'full_energy': DAILY_BOOSTS, 'turbo': DAILY_BOOSTS}
+        self.turbo_until = 0
+
+        self.energy = self.energy_max
+        self.updated_at = time()
+
+    @property
+    def energy_per_tap(self) -> int:
+        return self.levels['energy_per_tap']
+
+    @property
+    def energy_max(self) -> int:
+        return 1000 + 500 * (self.levels['energy_max'] - 1)
+
+    @property
+    def energy_per_second(self) -> int:
+        return 3 * self.levels['energy_per_second']
+
+    def regenerate(self) -> None:
+        now = time()
+        self.energy = min(self.energy_max, self.energy + (now - self.updated_at) * self.energy_per_second)
+        self.updated_at = now
+
+    def price(self, boost_type: str) -> int:
+        return BOOST_PRICES[boost_type] * 2 ** (self.levels[boost_type] - 1)
+
+    def profile(self, energy_stats: bool = False) -> dict:
+        self.regenerate()
+
+        profile = {
+            'id': self.user_id,
+            'score': self.score,
+            'energyLeft': int(self.energy),
+            'energyPerTap': self.energy_per_tap,
+            'earnedScoreToday': self.earned_today,
+            'earnedScoreThisWeek': self.earned_today,
+            'totalEarnedScore': self.total_earned,
+            'rank': 1,
+        }
+
+        if energy_stats:
+            profile.update(energyMax=self.energy_max, energyPerSecond=self.energy_per_second)
+
+        return profile
+
+
+class MockServer:
+    def __init__(self, latency: float = 0, error_rate: float = 0, rate_limit_rate: float = 0,
+                 token_ttl: int = 3600, max_rps: float = 0, energy_stats: bool = False):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.token_ttl = token_ttl
+        self.max_rps = max_rps
+        self.energy_stats = energy_stats
+
+        self.players: dict[str, Player] = {}
+        self.tokens: dict[str, tuple[str, float]] = {}
+        self.requests = 0
+        self.logins = 0
+        self.window_started_at = 0
+        self.window_requests = 0
+
+    @web.middleware
+    async def faults(self, request: web.Request, handler):
+        self.requests += 1
+
+        if self.max_rps:
+            now = monotonic()
+
+            if now - self.window_started_at >= 1:
+                self.window_started_at = now
+                self.window_requests = 0
+
+            self.window_requests += 1
+
+            if self.window_requests > self.max_rps:
+                return web.json_response({'message': 'Too Many Requests'}, status=429)
+
+        if self.latency:
+            await asyncio.sleep(uniform(self.latency / 2, self.latency * 1.5))
+
+        chance = random()
+        if chance < self.rate_limit_rate:
+            return web.json_response({'message': 'Too Many Requests'}, status=429, headers={'Retry-After': '1'})
+        if chance < self.rate_limit_rate + self.error_rate:
+            return web.json_response({'message': 'Internal Server Error'}, status=500)
+
+        return await handler(request)
+
+    def get_player(self, request: web.Request) -> Player:
+        token = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        user_id, expires_at = self.tokens.get(token, (None, 0))
+
+        if user_id is None or expires_at <= time():
+            raise web.HTTPUnauthorized()
+
+        return self.players[user_id]
+
+    async def login(self, request: web.Request) -> web.Response:
+        init_data = (await request.json())['initData']
+        user_id = parse_qs(init_data).get('user', [init_data])[0]
+
+        self.logins += 1
+        expires_at = time() + self.token_ttl
+        payload = base64.urlsafe_b64encode(json.dumps({'sub': user_id, 'exp': int(expires_at)}).encode())
+        token = f'mock.{payload.decode().rstrip("=")}.{self.logins}'
+
+        self.players.setdefault(user_id, Player(user_id=user_id))
+        self.tokens[token] = (user_id, expires_at)
+
+        return web.json_response({'accessToken': token})
+
+    async def profile(self, request: web.Request) -> web.Response:
+        return web.json_response(self.get_player(request).profile(energy_stats=self.energy_stats))
+
+    async def save_clicks(self, request: web.Request) -> web.Response:
+        player = self.get_player(request)
+        data = await request.json()
+        player.regenerate()
+
+        amount = int(data['amount'])
+
+        if data.get('isTurbo') and player.turbo_until >= time():
+            earned = amount
+        else:
+            earned = min(amount, int(player.energy))
+            player.energy -= earned
+
+        player.score += earned
+        player.earned_today += earned
+        player.total_earned += earned
+
+        return web.json_response({'energyLeft': int(player.energy), 'score': player.score,
+                                  'totalEarnedScore': player.total_earned})
+
+    async def daily_boosts(self, request: web.Request) -> web.Response:
+        player = self.get_player(request)
+
+        return web.json_response([
+            {'type': 'full_energy', 'availableCount': player.daily_boosts['full_energy']},
+            {'type': 'turbo', 'availableCount': player.daily_boosts['turbo']},
+        ])
+
+    async def available_boosts(self, request: web.Request) -> web.Response:
+        player = self.get_player(request)
+
+        return web.json_response([
+            {'type': boost_type, 'level': player.levels[boost_type] + 1, 'priceInScore': player.price(boost_type)}
+            for boost_type in ('energy_max', 'energy_per_second', 'energy_per_tap')
+        ])
+
+    async def activate_daily_boost(self, request: web.Request) -> web.Response:
+        player = self.get_player(request)
+        boost_type = (await request.json())['type']
+
+        if player.daily_boosts.get(boost_type, 0) <= 0:
+            raise web.HTTPBadRequest()
+
+        player.daily_boosts[boost_type] -= 1
+
+        if boost_type == 'full_energy':
+            player.regenerate()
+            player.energy = player.energy_max
+        else:
+            player.turbo_until = time() + TURBO_DURATION
+
+        return web.json_response({})
+
+    async def buy_boost(self, request: web.Request) -> web.Response:
+        player = self.get_player(request)
+        boost_type = (await request.json())['type']
+
+        price = player.price(boost_type)
+        if player.score < price:
+            raise web.HTTPBadRequest()
+
+        player.regenerate()
+        player.score -= price
+        player.levels[boost_type] += 1
+
+        return web.json_response({})
+
+    def create_app(self) -> web.Application:
+        app = web.Application(middlewares=[self.faults])
+        app.add_routes([
+            web.post('/auth/login', self.login),
+            web.get('/user/profile', self.profile),
+            web.post('/game/save-clicks', self.save_clicks),
+            web.get('/game/daily-boosts', self.daily_boosts),
+            web.get('/game/available-boosts', self.available_boosts),
+            web.post('/game/activate-daily-boost', self.activate_daily_boost),
+            web.post('/game/buy-boost', self.buy_boost),
+        ])
+
+        return app
+
+
+def run_server(host: str, port: int, latency: float, error_rate: float, rate_limit_rate: float,
+               token_ttl: int = 3600, max_rps: float = 0, energy_stats: bool = False) -> None:
+    server = MockServer(latency=latency, error_rate=error_rate, rate_limit_rate=rate_limit_rate, token_ttl=token_ttl,
+                        max_rps=max_rps, energy_stats=energy_stats)
+    web.run_app(server.create_app(), host=host, port=port, print=None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Local stand-in for the Wormfare clicker API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0, help='Mean response latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0, help='Share of requests answered with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0, help='Share of requests answered with 429')
+    parser.add_argument('--token-ttl', type=int, default=3600, help='Access token lifetime in seconds')
+    parser.add_argument('--max-rps', type=float, default=0, help='Requests per second above which 429 is answered')
+    parser.add_argument('--energy-stats', action='store_true',
+                        help='Send energyMax and energyPerSecond in the profile, the live API sends neither')
+    args = parser.parse_args()
+
+    run_server(host=args.host, port=args.port, latency=args.latency, error_rate=args.error_rate,
+               rate_limit_rate=args.rate_limit_rate, token_ttl=args.token_ttl, max_rps=args.max_rps,
+               energy_stats=args.energy_stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,422 @@
+import os
+import sys
+import argparse
+from time import perf_counter
+from itertools import product
+from statistics import median
+
+os.environ.setdefault('API_ID', '0')
+os.environ.setdefault('API_HASH', 'benchmark')
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from bot.config import settings
+from bot.core.models import Boost, DailyBoosts
+from bot.core.upgrades import plan_upgrade
+from .server import BOOST_PRICES, DAILY_BOOSTS, TURBO_DURATION
+
+
+DAY = 86400
+ACTION_DELAY = 5
+
+UPGRADES = ('energy_per_tap', 'energy_max', 'energy_per_second')
+
+NO_ACTION = 0
+ENERGY_BOOST = 1
+TURBO_BOOST = 2
+UPGRADE = 3
+
+UNKNOWN_PLAN = -2
+NO_PLAN = -1
+
+
+def parse_range(value: str) -> tuple[int, int]:
+    low, _, high = value.partition('-')
+
+    return int(low), int(high or low)
+
+
+def parse_levels(value: str) -> tuple[int, int, int]:
+    levels = tuple(int(level) for level in value.split(','))
+
+    if len(levels) != 3:
+        raise argparse.ArgumentTypeError("expected slap,energy,charge levels")
+
+    return levels
+
+
+def parse_switch(value: str) -> bool:
+    if value not in ('on', 'off'):
+        raise argparse.ArgumentTypeError("expected on or off")
+
+    return value == 'on'
+
+
+def format_range(value: tuple[int, int]) -> str:
+    return str(value[0]) if value[0] == value[1] else f'{value[0]}-{value[1]}'
+
+
+def format_switch(value: bool) -> str:
+    return 'on' if value else 'off'
+
+
+def build_grid(args: argparse.Namespace) -> list[dict]:
+    keys = ('slap_planner', 'upgrade_planner', 'sleep', 'slaps', 'min_energy', 'max_levels', 'scheduler',
+            'daily_energy', 'daily_turbo')
+
+    return [dict(zip(keys, values)) for values in product(*(getattr(args, key) for key in keys))]
+
+
+def get_planned_upgrade(cell: dict, levels: tuple[int, int, int], daily_energy: int, daily_turbo: int) -> int:
+    slap_level, energy_level, charge_level = levels
+    stats = dict(zip(UPGRADES, (slap_level, 1000 + 500 * (energy_level - 1), 3 * charge_level)))
+    upgradable_boosts = {boost_type: Boost(type=boost_type, level=level + 1,
+                                           price=BOOST_PRICES[boost_type] * 2 ** (level - 1))
+                         for boost_type, level in zip(UPGRADES, levels)}
+    max_levels = {boost_type: max_level for boost_type, max_level in zip(UPGRADES, cell['max_levels']) if max_level}
+
+    upgrade = plan_upgrade(stats=stats, upgradable_boosts=upgradable_boosts,
+                           daily_boosts=DailyBoosts(turbo=daily_turbo, energy=daily_energy), max_levels=max_levels,
+                           turbo_slaps=settings.ADD_SLAPS_ON_TURBO if cell['daily_turbo'] else 0,
+                           slaps_per_second=sum(settings.SLAPS_PER_SECOND) / 2,
+                           max_slaps_per_request=settings.MAX_SLAPS_PER_REQUEST,
+                           max_payback=settings.UPGRADE_MAX_PAYBACK,
+                           request_weight=settings.UPGRADE_REQUEST_WEIGHT)
+
+    return UPGRADES.index(upgrade['type']) if upgrade else NO_PLAN
+
+
+class Simulator:
+    def __init__(self, grid: list[dict], accounts: int, seed: int | None = None, energy_stats: bool = False):
+        self.grid = grid
+        self.accounts = accounts
+        self.energy_stats = energy_stats
+        self.size = len(grid) * accounts
+        self.rng = np.random.default_rng(seed)
+
+        def column(key: str, index: int | None = None):
+            values = [cell[key] if index is None else cell[key][index] for cell in grid]
+
+            return np.repeat(np.array(values), accounts)
+
+        self.cell = np.repeat(np.arange(len(grid)), accounts)
+        self.slap_planner = column('slap_planner')
+        self.upgrade_planner = column('upgrade_planner')
+        self.sleep_low = column('sleep', 0)
+        self.sleep_high = column('sleep', 1) + 1
+        self.slaps_low = column('slaps', 0)
+        self.slaps_high = column('slaps', 1) + 1
+        self.min_energy = column('min_energy')
+        self.max_levels = np.stack([column('max_levels', index) for index in range(len(UPGRADES))], axis=1)
+        self.scheduler = column('scheduler')
+        self.daily_energy_enabled = column('daily_energy')
+        self.daily_turbo_enabled = column('daily_turbo')
+
+        max_level = max(max(max(cell['max_levels']) for cell in grid), 1)
+        self.upgrade_plans = np.full((len(grid), max_level + 1, max_level + 1, max_level + 1,
+                                      DAILY_BOOSTS + 1, DAILY_BOOSTS + 1), UNKNOWN_PLAN, dtype=np.int8)
+
+        self.time = np.zeros(self.size)
+        self.day = np.zeros(self.size, dtype=np.int64)
+        self.levels = np.ones((self.size, len(UPGRADES)), dtype=np.int64)
+        self.prices = np.tile(np.array([BOOST_PRICES[boost_type] for boost_type in UPGRADES], dtype=np.float64),
+                              (self.size, 1))
+        self.energy = np.full(self.size, 1000.0)
+        self.score = np.zeros(self.size)
+        self.earned = np.zeros(self.size)
+        self.requests = np.zeros(self.size, dtype=np.int64)
+        self.steps = 0
+
+        self.daily_energy = np.full(self.size, DAILY_BOOSTS)
+        self.daily_turbo = np.full(self.size, DAILY_BOOSTS)
+        self.active_turbo = np.zeros(self.size, dtype=bool)
+        self.turbo_until = np.zeros(self.size)
+        self.action = np.zeros(self.size, dtype=np.int64)
+        self.cached_at = np.full(self.size, -np.inf)
+
+        self.last_slaps_at = np.full(self.size, np.nan)
+        self.planner_turbo_until = np.zeros(self.size)
+        self.turbo_calls_left = np.zeros(self.size, dtype=np.int64)
+
+    def randint(self, low, high):
+        return low + (self.rng.random(self.size) * (high - low)).astype(np.int64)
+
+    def plan_upgrades(self):
+        keys = (self.cell, self.levels[:, 0], self.levels[:, 1], self.levels[:, 2], self.daily_energy,
+                self.daily_turbo)
+        plans = self.upgrade_plans[keys]
+        unknown = plans == UNKNOWN_PLAN
+
+        if unknown.any():
+            for key in np.unique(np.stack([key[unknown] for key in keys], axis=1), axis=0):
+                cell, slap_level, energy_level, charge_level, daily_energy, daily_turbo = map(int, key)
+                self.upgrade_plans[tuple(key)] = get_planned_upgrade(
+                    cell=self.grid[cell], levels=(slap_level, energy_level, charge_level),
+                    daily_energy=daily_energy, daily_turbo=daily_turbo)
+
+            plans = self.upgrade_plans[keys]
+
+        return plans
+
+    def get_spend_time(self, energy, slap_level):
+        slaps = np.minimum(energy // slap_level, settings.MAX_SLAPS_PER_REQUEST)
+
+        return np.minimum(np.round(slaps / (sum(settings.SLAPS_PER_SECOND) / 2)), settings.MAX_SLEEP_BY_ENERGY)
+
+    def get_sleep_time(self, default, energy_max, per_second, slap_level):
+        if self.energy_stats:
+            target_energy = energy_max * settings.ENERGY_TARGET_PERCENT / 100
+        else:
+            target_energy = (self.slaps_high - 1) * slap_level
+
+        sleep_time = np.maximum(target_energy - self.energy, 0) / per_second
+        min_sleep_time = np.where(self.slap_planner,
+                                  np.maximum(self.sleep_low, self.get_spend_time(self.energy, slap_level)),
+                                  self.sleep_low)
+        sleep_time = np.minimum(np.maximum(sleep_time, min_sleep_time), settings.MAX_SLEEP_BY_ENERGY)
+        sleep_time = np.round(sleep_time) + self.randint(settings.SLEEP_JITTER[0], settings.SLEEP_JITTER[1] + 1)
+
+        return np.where(self.scheduler, sleep_time, default)
+
+    def step(self, active) -> None:
+        now = self.time
+
+        day = (now // DAY).astype(np.int64)
+        new_day = active & (day > self.day)
+        self.day[new_day] = day[new_day]
+        self.daily_energy[new_day] = DAILY_BOOSTS
+        self.daily_turbo[new_day] = DAILY_BOOSTS
+
+        acting = active & (self.action != NO_ACTION)
+        sleep = np.where(acting, ACTION_DELAY, 0)
+
+        turbo = acting & (self.action == TURBO_BOOST)
+        self.daily_turbo -= turbo
+        self.active_turbo |= turbo
+        self.turbo_until = np.where(turbo, now + TURBO_DURATION, self.turbo_until)
+        self.planner_turbo_until = np.where(turbo, now + settings.TURBO_DURATION, self.planner_turbo_until)
+        self.turbo_calls_left = np.where(turbo, max(settings.TURBO_BURST_CALLS, 1), self.turbo_calls_left)
+        self.last_slaps_at = np.where(turbo, now, self.last_slaps_at)
+
+        for index in range(len(UPGRADES)):
+            upgrade = acting & (self.action == UPGRADE + index)
+            self.score -= np.where(upgrade, self.prices[:, index], 0)
+            self.levels[:, index] += upgrade
+            self.prices[upgrade, index] *= 2
+            self.requests += upgrade
+
+        slap_level = self.levels[:, 0]
+        energy_max = 1000 + 500 * (self.levels[:, 1] - 1)
+        per_second = 3 * self.levels[:, 2]
+
+        energy = acting & (self.action == ENERGY_BOOST)
+        self.daily_energy -= energy
+        self.energy = np.where(energy, energy_max, self.energy)
+        sleep = np.where(energy & self.slap_planner,
+                         np.maximum(self.get_spend_time(energy_max, slap_level), ACTION_DELAY), sleep)
+
+        self.requests += acting
+        self.cached_at[acting] = -np.inf
+        self.action[acting] = NO_ACTION
+
+        slapping = active & ~acting
+        planning = slapping & self.slap_planner
+        planner_turbo = (self.turbo_calls_left > 0) & (now < self.planner_turbo_until)
+        self.active_turbo &= ~planning | planner_turbo
+
+        slaps_per_second = self.rng.uniform(settings.SLAPS_PER_SECOND[0], settings.SLAPS_PER_SECOND[1], self.size)
+        elapsed_slaps = np.round((now - self.last_slaps_at) * slaps_per_second)
+        energy_slaps = np.fmin(self.energy // slap_level, elapsed_slaps)
+        planned_slaps = np.where(planner_turbo,
+                                 elapsed_slaps + settings.ADD_SLAPS_ON_TURBO // max(settings.TURBO_BURST_CALLS, 1),
+                                 np.clip(energy_slaps, 1, settings.MAX_SLAPS_PER_REQUEST))
+        random_slaps = (self.randint(self.slaps_low, self.slaps_high)
+                        + self.active_turbo * settings.ADD_SLAPS_ON_TURBO)
+
+        self.turbo_calls_left = np.where(planning, np.where(planner_turbo, self.turbo_calls_left - 1, 0),
+                                         self.turbo_calls_left)
+        self.last_slaps_at = np.where(planning, now, self.last_slaps_at)
+
+        slaps = np.where(self.slap_planner, planned_slaps, random_slaps) * slap_level
+        turbo_slaps = self.active_turbo & (now <= self.turbo_until)
+        earned = np.where(turbo_slaps, slaps, np.minimum(slaps, np.floor(self.energy)))
+        earned = np.where(slapping, earned, 0)
+
+        self.energy -= np.where(turbo_slaps, 0, earned)
+        self.score += earned
+        self.earned += earned
+
+        missed = slapping & (now - self.cached_at >= settings.BOOSTS_CACHE_TTL)
+        self.requests += slapping + 2 * missed
+        self.cached_at[missed] = now[missed]
+
+        available_energy = np.floor(self.energy)
+        low_energy = available_energy < self.min_energy
+        deciding = slapping & ~self.active_turbo
+
+        use_energy = deciding & low_energy & (self.daily_energy > 0) & self.daily_energy_enabled
+        use_turbo = deciding & ~use_energy & (self.daily_turbo > 0) & self.daily_turbo_enabled
+        resting = deciding & ~use_energy & ~use_turbo
+
+        self.action[use_energy] = ENERGY_BOOST
+        self.action[use_turbo] = TURBO_BOOST
+
+        upgrade_plans = self.plan_upgrades()
+
+        for index in range(len(UPGRADES)):
+            upgrade = resting & np.where(self.upgrade_planner,
+                                         (upgrade_plans == index) & (self.score >= self.prices[:, index]),
+                                         (self.score > self.prices[:, index])
+                                         & (self.levels[:, index] + 1 <= self.max_levels[:, index]))
+            self.action[upgrade] = UPGRADE + index
+            resting &= ~upgrade
+
+        sleep = np.where(deciding & ~resting, ACTION_DELAY, sleep)
+
+        turbo_delay = np.maximum(np.round((self.planner_turbo_until - 1 - now) / np.maximum(self.turbo_calls_left, 1)),
+                                 1)
+        turbo_resting = slapping & self.active_turbo & ~(self.slap_planner & planner_turbo
+                                                          & (self.turbo_calls_left > 0))
+        sleep = np.where(slapping & self.active_turbo & ~turbo_resting, turbo_delay, sleep)
+
+        default = np.where(resting & low_energy, settings.SLEEP_BY_MIN_ENERGY,
+                           self.randint(self.sleep_low, self.sleep_high))
+        resting |= turbo_resting
+        sleep = np.where(resting, self.get_sleep_time(default=default, energy_max=energy_max, per_second=per_second,
+                                                      slap_level=slap_level), sleep)
+        sleep = np.where(active, np.maximum(sleep, 1), 0)
+
+        self.active_turbo &= ~turbo_resting
+        self.time += sleep
+        self.energy = np.minimum(self.energy + sleep * per_second, energy_max)
+
+    def run(self, days: float) -> None:
+        horizon = days * DAY
+
+        with np.errstate(invalid='ignore'):
+            while True:
+                active = self.time < horizon
+
+                if not active.any():
+                    break
+
+                self.step(active=active)
+                self.steps += 1
+
+    def get_results(self, days: float) -> list[dict]:
+        def per_cell(values):
+            return values.reshape(len(self.grid), self.accounts).mean(axis=1)
+
+        score = per_cell(self.earned) / days
+        requests = per_cell(self.requests) / days
+        levels = [per_cell(self.levels[:, index]) for index in range(len(UPGRADES))]
+
+        return [dict(cell, score=score[index], requests=requests[index],
+                     levels=tuple(level[index] for level in levels))
+                for index, cell in enumerate(self.grid)]
+
+
+def print_results(results: list[dict]) -> None:
+    print(f"{'Slap planner':>12} {'Upgrade planner':>15} {'Sleep':>9} {'Slaps':>9} {'Min energy':>10} "
+          f"{'Max levels':>10} {'Scheduler':>9} {'Energy':>6} {'Turbo':>5} {'Score/day':>11} {'Requests/day':>12} "
+          f"{'Score/request':>13} {'Levels':>14}")
+
+    for result in sorted(results, key=lambda result: result['score'], reverse=True):
+        slaps = 'planned' if result['slap_planner'] else format_range(result['slaps'])
+
+        print(f"{format_switch(result['slap_planner']):>12} {format_switch(result['upgrade_planner']):>15} "
+              f"{format_range(result['sleep']):>9} {slaps:>9} {result['min_energy']:>10} "
+              f"{','.join(map(str, result['max_levels'])):>10} {format_switch(result['scheduler']):>9} "
+              f"{format_switch(result['daily_energy']):>6} {format_switch(result['daily_turbo']):>5} "
+              f"{result['score']:>11.0f} {result['requests']:>12.0f} "
+              f"{result['score'] / max(result['requests'], 1):>13.1f} "
+              f"{'/'.join(f'{level:.1f}' for level in result['levels']):>14}")
+
+
+def run_simulation(args: argparse.Namespace) -> None:
+    grid = build_grid(args=args)
+    simulator = Simulator(grid=grid, accounts=args.accounts, seed=args.seed, energy_stats=args.energy_stats)
+
+    started_at = perf_counter()
+    simulator.run(days=args.days)
+    elapsed = perf_counter() - started_at
+
+    print_results(results=simulator.get_results(days=args.days))
+
+    account_days = simulator.size * args.days
+    print(f"\nSimulated {account_days:.0f} account-days ({len(grid)} settings x {args.accounts} accounts) "
+          f"in {elapsed:.2f}s | {account_days / elapsed:.0f} account-days/s | {simulator.steps} steps")
+
+
+def run_bench(args: argparse.Namespace) -> None:
+    grid = build_grid(args=args)
+    timings = []
+
+    for _ in range(args.repeat):
+        simulator = Simulator(grid=grid, accounts=args.accounts, seed=args.seed, energy_stats=args.energy_stats)
+
+        started_at = perf_counter()
+        simulator.run(days=args.days)
+        timings.append(perf_counter() - started_at)
+
+    account_days = simulator.size * args.days
+    steps = simulator.size * simulator.steps
+
+    print(f"Accounts:     {simulator.size} ({len(grid)} settings x {args.accounts})")
+    print(f"Virtual time: {args.days:g} days | {simulator.steps} steps")
+    print(f"Elapsed:      best {min(timings):.3f}s | median {median(timings):.3f}s ({args.repeat} runs)")
+    print(f"Throughput:   {account_days / min(timings):.0f} account-days/s | "
+          f"{steps / min(timings) / 1e6:.1f}M account-steps/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Simulate the clicker economy in virtual time to tune settings '
+                                                 'offline. Every option accepts several values, all combinations '
+                                                 'are simulated')
+    parser.add_argument('-n', '--accounts', type=int, default=1000, help='Simulated accounts per settings combination')
+    parser.add_argument('--days', type=float, default=1, help='Virtual time to simulate in days')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--slap-planner', type=parse_switch, nargs='+', default=[settings.USE_SLAP_PLANNER],
+                        help='USE_SLAP_PLANNER: on, off or both')
+    parser.add_argument('--upgrade-planner', type=parse_switch, nargs='+', default=[settings.USE_UPGRADE_PLANNER],
+                        help='USE_UPGRADE_PLANNER: on, off or both')
+    parser.add_argument('--sleep', type=parse_range, nargs='+', default=[tuple(settings.SLEEP_BETWEEN_SLAP)],
+                        help='SLEEP_BETWEEN_SLAP ranges, e.g. 20-30 60-90')
+    parser.add_argument('--slaps', type=parse_range, nargs='+', default=[tuple(settings.RANDOM_SLAPS_COUNT)],
+                        help='RANDOM_SLAPS_COUNT ranges, e.g. 50-200, used with the slap planner off')
+    parser.add_argument('--min-energy', type=int, nargs='+', default=[settings.MIN_AVAILABLE_ENERGY],
+                        help='MIN_AVAILABLE_ENERGY values')
+    parser.add_argument('--max-levels', type=parse_levels, nargs='+',
+                        default=[(settings.MAX_SLAP_LEVEL if settings.AUTO_UPGRADE_SLAP else 0,
+                                  settings.MAX_ENERGY_LEVEL if settings.AUTO_UPGRADE_ENERGY else 0,
+                                  settings.MAX_CHARGE_LEVEL if settings.AUTO_UPGRADE_CHARGE else 0)],
+                        help='MAX_SLAP_LEVEL,MAX_ENERGY_LEVEL,MAX_CHARGE_LEVEL triples, e.g. 10,10,5 5,5,5')
+    parser.add_argument('--scheduler', type=parse_switch, nargs='+', default=[settings.USE_ENERGY_SCHEDULER],
+                        help='USE_ENERGY_SCHEDULER: on, off or both')
+    parser.add_argument('--daily-energy', type=parse_switch, nargs='+', default=[settings.APPLY_DAILY_ENERGY],
+                        help='APPLY_DAILY_ENERGY: on, off or both')
+    parser.add_argument('--daily-turbo', type=parse_switch, nargs='+', default=[settings.APPLY_DAILY_TURBO],
+                        help='APPLY_DAILY_TURBO: on, off or both')
+    parser.add_argument('--energy-stats', action='store_true',
+                        help='Model a profile with energyMax and energyPerSecond, the live API sends neither')
+    parser.add_argument('--bench', action='store_true', help='Measure the simulator speed instead of printing results')
+    parser.add_argument('--repeat', type=int, default=5, help='Benchmark runs')
+    args = parser.parse_args()
+
+    if np is None:
+        sys.exit("The simulator requires numpy: pip install numpy")
+
+    if args.slap_planner == [True] and len(args.slaps) > 1:
+        print("--slaps has no effect with the slap planner on, add --slap-planner off to compare slap counts\n")
+
+    if args.bench:
+        run_bench(args=args)
+    else:
+        run_simulation(args=args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,6 +9,8 @@ class Settings(BaseSettings):
     API_ID: int
     API_HASH: str
 
+    API_URL: str = 'https://api.clicker.wormfare.com'
+
     MIN_AVAILABLE_ENERGY: int = 100
     SLEEP_BY_MIN_ENERGY: int = 200
 
@@ -18,6 +22,9 @@ class Settings(BaseSettings):
     MAX_ENERGY_LEVEL: int = 10
     AUTO_UPGRADE_CHARGE: bool = True
     MAX_CHARGE_LEVEL: int = 5
+    USE_UPGRADE_PLANNER: bool = True
+    UPGRADE_MAX_PAYBACK: int = 168
+    UPGRADE_REQUEST_WEIGHT: float = 0.5
 
     APPLY_DAILY_ENERGY: bool = True
     APPLY_DAILY_TURBO: bool = True
@@ -25,7 +32,89 @@ class Settings(BaseSettings):
     RANDOM_SLAPS_COUNT: list[int] = [50, 200]
     SLEEP_BETWEEN_SLAP: list[int] = [20, 30]
 
+    USE_SLAP_PLANNER: bool = True
+    SLAPS_PER_SECOND: list[int] = [4, 8]
+    MAX_SLAPS_PER_REQUEST: int = 1500
+    TURBO_DURATION: int = 20
+    TURBO_BURST_CALLS: int = 3
+
     USE_PROXY_FROM_FILE: bool = False
+    PROXY_CHECK_URL: str = 'https://httpbin.org/ip'
+    PROXY_CHECK_TIMEOUT: int = 10
+    PROXY_CHECK_INTERVAL: int = 300
+    PROXY_CHECK_CONCURRENCY: int = 50
+    PROXY_MAX_LATENCY: float = 5
+    PROXY_MAX_ERROR_RATE: float = 0.5
+    PROXY_MAX_ACCOUNTS: int = 50
+
+    BOOSTS_CACHE_TTL: int = 900
+
+    USE_ENERGY_SCHEDULER: bool = True
+    ENERGY_TARGET_PERCENT: int = 90
+    MAX_SLEEP_BY_ENERGY: int = 1800
+    SLEEP_JITTER: list[int] = [0, 10]
+
+    USE_SESSION_STORE: bool = False
+    IMPORT_CONCURRENCY: int = 10
+    IMPORT_TIMEOUT: int = 30
+
+    USE_AUTH_CACHE: bool = True
+    ACCESS_TOKEN_TTL: int = 3600
+    TG_WEB_DATA_TTL: int = 3600
+    TOKEN_REFRESH_MARGIN: int = 300
+    TOKEN_REFRESH_SPREAD: int = 300
+
+    AUTH_MAX_CONCURRENT: int = 5
+    AUTH_RAMP_WINDOW: int = 60
+
+    ENGINE: Literal['tasks', 'scheduler'] = 'tasks'
+    ENGINE_WORKERS: int = 100
+    RESTART_DELAY: int = 30
+
+    LOG_FORMAT: Literal['text', 'json'] = 'text'
+    LOG_MODE: Literal['full', 'summary'] = 'full'
+    LOG_ENQUEUE: bool = True
+    LOG_SAMPLE_RATE: float = 0.01
+    LOG_SUMMARY_INTERVAL: int = 60
+
+    USE_UVLOOP: bool = False
+    WORKERS_STATUS_INTERVAL: int = 60
+
+    LOOP_LAG_INTERVAL: float = 0.5
+    LOOP_REPORT_INTERVAL: int = 300
+    SLOW_CALLBACK_DURATION: float = 0.1
+    PROFILE_DURATION: int = 60
+    PROFILE_DIR: str = 'profiles'
+
+    RETRY_ATTEMPTS: int = 3
+    RETRY_BASE_DELAY: float = 1
+    RETRY_MAX_DELAY: float = 60
+    CIRCUIT_BREAKER_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_COOLDOWN: int = 60
+
+    USE_RATE_LIMITER: bool = True
+    RATE_LIMIT_INITIAL: float = 10
+    RATE_LIMIT_MIN: float = 0.5
+    RATE_LIMIT_MAX: float = 100
+    RATE_LIMIT_BURST: int = 5
+    RATE_LIMIT_INCREASE: float = 1
+    RATE_LIMIT_DECREASE: float = 0.7
+
+    METRICS_HOST: str = '127.0.0.1'
+    METRICS_PORT: int = 0
+    METRICS_FILE: str = ''
+    METRICS_INTERVAL: int = 60
+
+    HTTP_POOL_LIMIT: int = 100
+    HTTP_DNS_CACHE_TTL: int = 300
+    HTTP_KEEPALIVE_TIMEOUT: int = 60
+
+    USE_STATS_STORE: bool = True
+    STATS_INTERVAL: int = 300
+    STATS_FLUSH_INTERVAL: int = 30
+    STATS_REPORT_WINDOWS: list[int] = [1, 24, 168]
+
+    CONFIG_RELOAD_INTERVAL: int = 10
 
 
 settings = Settings()
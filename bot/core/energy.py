@@ -0,0 +1,75 @@
+from time import time
+
+from .models import Profile
+
+
+class EnergyModel:
+    __slots__ = ('smoothing', 'energy', 'max_energy', 'peak_energy', 'per_second', 'updated_at')
+
+    def __init__(self, smoothing: float = 0.3):
+        self.smoothing = smoothing
+
+        self.energy = 0
+        self.max_energy: int | None = None
+        self.peak_energy = 0
+        self.per_second: float | None = None
+        self.updated_at = 0
+
+    def update_from_profile(self, profile: Profile) -> None:
+        if profile.energy_max:
+            self.max_energy = profile.energy_max
+
+        if profile.energy_per_second:
+            self.per_second = profile.energy_per_second
+
+        if profile.energy_left is not None:
+            self.energy = profile.energy_left
+            self.peak_energy = max(self.peak_energy, profile.energy_left)
+            self.updated_at = time()
+
+    def observe(self, energy_left: int, spent: int) -> None:
+        now = time()
+        energy_before = energy_left + spent
+
+        elapsed = now - self.updated_at
+        is_capped = self.max_energy is not None and energy_before >= self.max_energy
+        if self.updated_at and elapsed > 0 and energy_left > 0 and not is_capped:
+            per_second = max(energy_before - self.energy, 0) / elapsed
+
+            if self.per_second is None:
+                self.per_second = per_second
+            else:
+                self.per_second += self.smoothing * (per_second - self.per_second)
+
+        self.energy = energy_left
+        self.peak_energy = max(self.peak_energy, energy_before)
+        self.updated_at = now
+
+    def scale(self, max_energy: float = 1, per_second: float = 1) -> None:
+        self.peak_energy *= max_energy
+
+        if self.max_energy is not None:
+            self.max_energy = round(self.max_energy * max_energy)
+
+        if self.per_second is not None:
+            self.per_second *= per_second
+
+    def refill(self) -> None:
+        if self.max_energy is not None:
+            self.energy = self.max_energy
+            self.updated_at = time()
+
+    def predict(self, at: float | None = None) -> float:
+        at = time() if at is None else at
+        energy = self.energy + (self.per_second or 0) * max(at - self.updated_at, 0)
+
+        return min(energy, self.max_energy) if self.max_energy is not None else energy
+
+    def seconds_until(self, target: float) -> float | None:
+        if not self.per_second:
+            return None
+
+        if self.max_energy is not None:
+            target = min(target, self.max_energy)
+
+        return max(target - self.predict(), 0) / self.per_second
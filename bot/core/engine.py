@@ -0,0 +1,128 @@
+import heapq
+import asyncio
+from time import time, monotonic
+from random import uniform
+from functools import partial
+from itertools import count
+from contextlib import suppress
+
+from bot.config import settings
+from bot.utils import logger
+from bot.utils.auth_cache import auth_cache
+from bot.utils.auth_scheduler import AuthScheduler
+from bot.utils.fleet import fleet_status
+from bot.utils.metrics import metrics
+from bot.utils.proxy_pool import proxy_pool
+from bot.exceptions import InvalidSession
+from .slapper import Slapper
+from .tg_client import LazyClient
+
+
+class Engine:
+    def __init__(self, auth_scheduler: AuthScheduler):
+        self.auth_scheduler = auth_scheduler
+
+        self.timers: list[tuple[float, int, Slapper, bool]] = []
+        self.sequence = count()
+        self.wakeup = asyncio.Event()
+        self.queue: asyncio.Queue[tuple[Slapper, bool]] = asyncio.Queue(maxsize=settings.ENGINE_WORKERS)
+
+        self.slappers: dict[str, Slapper] = {}
+        self.restarts: dict[str, int] = {}
+
+    def schedule(self, slapper: Slapper, delay: float, refresh: bool = False) -> None:
+        heapq.heappush(self.timers, (monotonic() + delay, next(self.sequence), slapper, refresh))
+        self.wakeup.set()
+
+    def schedule_refresh(self, slapper: Slapper, refresh_at: float) -> None:
+        self.schedule(slapper=slapper, delay=max(refresh_at - time(), 0), refresh=True)
+
+    def add(self, tg_client: LazyClient, proxy: str | None) -> None:
+        slapper = Slapper(tg_client=tg_client, auth_scheduler=self.auth_scheduler, blocking=False)
+        slapper.proxy = proxy
+        slapper.token_manager.scheduler = partial(self.schedule_refresh, slapper)
+
+        self.slappers[slapper.session_name] = slapper
+        self.schedule(slapper=slapper, delay=uniform(0, settings.AUTH_RAMP_WINDOW))
+
+    async def dispatch(self) -> None:
+        while self.slappers:
+            if not self.timers:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+
+            due_in = self.timers[0][0] - monotonic()
+
+            if due_in > 0:
+                self.wakeup.clear()
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=due_in)
+                continue
+
+            _, _, slapper, refresh = heapq.heappop(self.timers)
+            await self.queue.put((slapper, refresh))
+
+    async def work(self) -> None:
+        while True:
+            slapper, refresh = await self.queue.get()
+
+            try:
+                if refresh:
+                    await self.run_refresh(slapper=slapper)
+                else:
+                    await self.run_step(slapper=slapper)
+            finally:
+                self.queue.task_done()
+
+    async def run_refresh(self, slapper: Slapper) -> None:
+        token_manager = slapper.token_manager
+
+        if (slapper.session_name not in self.slappers or slapper.http_client is None
+                or time() < token_manager.refresh_at):
+            return
+
+        if await token_manager.refresh_token():
+            self.schedule_refresh(slapper=slapper, refresh_at=token_manager.refresh_at)
+
+    async def run_step(self, slapper: Slapper) -> None:
+        session_name = slapper.session_name
+
+        try:
+            if slapper.http_client is None:
+                await slapper.start(proxy=slapper.proxy)
+
+            delay = await slapper.step()
+        except InvalidSession:
+            slapper.token_manager.stop()
+            self.slappers.pop(session_name, None)
+            proxy_pool.release(session_name=session_name)
+            self.wakeup.set()
+            self.auth_scheduler.mark_failed(session_name=session_name)
+            fleet_status.mark_failed(session_name=session_name)
+            metrics.remove_account(session_name=session_name)
+            auth_cache.set_validation(session_name=session_name, valid=False, reason='InvalidSession')
+            logger.error(f"{session_name} | Invalid Session")
+
+            return
+        except Exception as error:
+            restarts = self.restarts[session_name] = self.restarts.get(session_name, 0) + 1
+            restart_delay = min(settings.RESTART_DELAY * 2 ** (restarts - 1), 600)
+
+            slapper.http_client = None
+            logger.error(f"{session_name} | Crashed: {error} | Restart in {restart_delay}s")
+            self.schedule(slapper=slapper, delay=restart_delay)
+
+            return
+
+        self.restarts.pop(session_name, None)
+        self.schedule(slapper=slapper, delay=delay)
+
+    async def run(self) -> None:
+        workers = [asyncio.create_task(self.work()) for _ in range(settings.ENGINE_WORKERS)]
+
+        try:
+            await self.dispatch()
+        finally:
+            for worker in workers:
+                worker.cancel()
@@ -0,0 +1,49 @@
+from time import time
+from datetime import datetime, timezone
+
+from .models import Boost, DailyBoosts
+
+
+class BoostsCache:
+    __slots__ = ('ttl', 'daily_boosts', 'upgradable_boosts', 'updated_at', 'updated_day', 'hits', 'misses')
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+        self.daily_boosts: DailyBoosts | None = None
+        self.upgradable_boosts: dict[str, Boost] | None = None
+
+        self.updated_at = 0
+        self.updated_day = None
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def utc_day():
+        return datetime.now(tz=timezone.utc).date()
+
+    def is_fresh(self) -> bool:
+        return (self.daily_boosts is not None
+                and self.upgradable_boosts is not None
+                and self.updated_day == self.utc_day()
+                and time() - self.updated_at < self.ttl)
+
+    def get(self) -> tuple[DailyBoosts, dict[str, Boost]] | None:
+        if not self.is_fresh():
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self.daily_boosts, self.upgradable_boosts
+
+    def update(self, daily_boosts: DailyBoosts, upgradable_boosts: dict[str, Boost]) -> None:
+        self.daily_boosts = daily_boosts
+        self.upgradable_boosts = upgradable_boosts
+
+        self.updated_at = time()
+        self.updated_day = self.utc_day()
+
+    def invalidate(self) -> None:
+        self.daily_boosts = None
+        self.upgradable_boosts = None
@@ -0,0 +1,40 @@
+import aiohttp
+from aiohttp_proxy import ProxyConnector
+
+from bot.config import settings
+from .headers import headers
+from .models import json_dumps
+
+
+class HttpPool:
+    def __init__(self):
+        self.sessions: dict[str | None, aiohttp.ClientSession] = {}
+        self.trace_configs: list[aiohttp.TraceConfig] = []
+
+    def get_session(self, proxy: str | None) -> aiohttp.ClientSession:
+        http_client = self.sessions.get(proxy)
+
+        if http_client is None or http_client.closed:
+            connector_options = dict(
+                limit=settings.HTTP_POOL_LIMIT,
+                ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT
+            )
+            connector = (ProxyConnector.from_url(proxy, **connector_options) if proxy
+                         else aiohttp.TCPConnector(**connector_options))
+
+            http_client = aiohttp.ClientSession(headers=headers, connector=connector,
+                                                cookie_jar=aiohttp.DummyCookieJar(), json_serialize=json_dumps,
+                                                trace_configs=self.trace_configs or None)
+            self.sessions[proxy] = http_client
+
+        return http_client
+
+    async def close(self) -> None:
+        for http_client in self.sessions.values():
+            await http_client.close()
+
+        self.sessions.clear()
+
+
+http_pool = HttpPool()
@@ -0,0 +1,84 @@
+import json
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data: str | bytes):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def json_dumps(data) -> str:
+    return orjson.dumps(data).decode() if orjson else json.dumps(data)
+
+
+@dataclass(slots=True)
+class Profile:
+    score: int
+    energy_per_tap: int
+    earned_today: int
+    earned_week: int
+    rank: int
+    energy_left: int | None = None
+    energy_max: int | None = None
+    energy_per_second: float | None = None
+
+    @classmethod
+    def from_json(cls, data: dict[str]) -> 'Profile':
+        return cls(score=data['score'], energy_per_tap=data['energyPerTap'], earned_today=data['earnedScoreToday'],
+                   earned_week=data['earnedScoreThisWeek'], rank=data['rank'], energy_left=data.get('energyLeft'),
+                   energy_max=data.get('energyMax'), energy_per_second=data.get('energyPerSecond'))
+
+
+@dataclass(slots=True)
+class SlapResult:
+    energy_left: int
+    score: int
+    total_earned: int
+
+    @classmethod
+    def from_json(cls, data: dict[str]) -> 'SlapResult':
+        return cls(energy_left=data['energyLeft'], score=data['score'], total_earned=data['totalEarnedScore'])
+
+
+@dataclass(slots=True)
+class DailyBoosts:
+    turbo: int = 0
+    energy: int = 0
+
+    @classmethod
+    def from_json(cls, data: list[dict[str]]) -> 'DailyBoosts':
+        counts = {boost['type']: boost['availableCount'] for boost in data}
+
+        return cls(turbo=counts.get('turbo', 0), energy=counts.get('full_energy', 0))
+
+
+@dataclass(slots=True)
+class Boost:
+    type: str
+    level: int
+    price: int
+
+    @classmethod
+    def from_json(cls, data: dict[str]) -> 'Boost':
+        return cls(type=data['type'], level=data['level'], price=data['priceInScore'])
+
+
+def parse_upgradable_boosts(data: list[dict[str]]) -> dict[str, Boost]:
+    return {boost['type']: Boost.from_json(boost) for boost in data}
+
+
+@dataclass(slots=True)
+class AccountState:
+    active_turbo: bool = False
+    next_action: Callable[[], Awaitable[int]] | None = None
+    failures: int = 0
+
+    profile: Profile | None = None
+    balance: int = 0
+    slap_level: int = 1
+    upgrade_target: tuple[str, int] | None = None
@@ -0,0 +1,68 @@
+from time import time
+from random import uniform
+
+from bot.config import settings
+
+
+class SlapPlanner:
+    __slots__ = ('last_slaps_at', 'turbo_until', 'turbo_calls_left')
+
+    def __init__(self):
+        self.last_slaps_at = 0
+        self.turbo_until = 0
+        self.turbo_calls_left = 0
+
+    def reset(self) -> None:
+        self.last_slaps_at = 0
+        self.turbo_until = 0
+        self.turbo_calls_left = 0
+
+    @staticmethod
+    def get_slaps_per_second() -> float:
+        return uniform(settings.SLAPS_PER_SECOND[0], settings.SLAPS_PER_SECOND[1])
+
+    def start_turbo(self) -> None:
+        self.last_slaps_at = time()
+        self.turbo_until = self.last_slaps_at + settings.TURBO_DURATION
+        self.turbo_calls_left = max(settings.TURBO_BURST_CALLS, 1)
+
+    def is_turbo_active(self) -> bool:
+        return self.turbo_calls_left > 0 and time() < self.turbo_until
+
+    def plan(self, energy: float, slap_level: int) -> tuple[int, float]:
+        now = time()
+        slaps_per_second = self.get_slaps_per_second()
+        elapsed = now - self.last_slaps_at if self.last_slaps_at else None
+
+        if self.is_turbo_active():
+            self.turbo_calls_left -= 1
+
+            slaps = (round(elapsed * slaps_per_second)
+                     + settings.ADD_SLAPS_ON_TURBO // max(settings.TURBO_BURST_CALLS, 1))
+            duration = elapsed
+        else:
+            self.turbo_calls_left = 0
+
+            slaps = int(energy // slap_level)
+
+            if elapsed is not None:
+                slaps = min(slaps, round(elapsed * slaps_per_second))
+
+            slaps = min(max(slaps, 1), settings.MAX_SLAPS_PER_REQUEST)
+            duration = slaps / slaps_per_second
+
+        self.last_slaps_at = now
+
+        return slaps, duration
+
+    def get_turbo_delay(self) -> int | None:
+        if not self.is_turbo_active():
+            return None
+
+        return max(round((self.turbo_until - 1 - time()) / self.turbo_calls_left), 1)
+
+    def get_spend_time(self, energy: float, slap_level: int) -> int:
+        slaps = min(energy // slap_level, settings.MAX_SLAPS_PER_REQUEST)
+        slaps_per_second = (settings.SLAPS_PER_SECOND[0] + settings.SLAPS_PER_SECOND[1]) / 2
+
+        return min(round(slaps / slaps_per_second), settings.MAX_SLEEP_BY_ENERGY)
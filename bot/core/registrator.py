@@ -1,7 +1,30 @@
+import os
+import csv
+import glob
+import struct
+import binascii
+import shutil
+import asyncio
+from time import strftime
+from itertools import cycle
+from collections import Counter
+from contextlib import suppress
+
+from better_proxy import Proxy
 from pyrogram import Client
+from pyrogram.errors import Unauthorized, AuthKeyDuplicated
 
 from bot.config import settings
 from bot.utils import logger
+from bot.utils.auth_cache import auth_cache
+from bot.utils.session_store import session_store
+
+
+VALID = 'valid'
+DEAD = 'dead'
+FAILED = 'failed'
+
+QUARANTINE_DIR = 'sessions/quarantine'
 
 
 async def register_sessions() -> None:
@@ -26,4 +49,141 @@ async def register_sessions() -> None:
     async with session:
         user_data = await session.get_me()
 
+    auth_cache.set_validation(session_name=session_name, valid=True)
+
     logger.success(f'Session added successfully @{user_data.username} | {user_data.first_name} {user_data.last_name}')
+
+
+def get_proxy_dict(proxy: str | None) -> dict | None:
+    if not proxy:
+        return None
+
+    proxy = Proxy.from_str(proxy)
+
+    return dict(scheme=proxy.protocol, hostname=proxy.host, port=proxy.port, username=proxy.login,
+                password=proxy.password)
+
+
+def read_sessions(path: str) -> list[tuple[str | None, str | None, str]]:
+    if os.path.isdir(path):
+        return [(os.path.splitext(os.path.basename(file))[0], None, file)
+                for file in sorted(glob.glob(os.path.join(path, '*.session')))]
+
+    sessions = []
+
+    with open(file=path, encoding='utf-8-sig') as file:
+        for row in file:
+            row = row.strip()
+
+            if not row:
+                continue
+
+            session_name, _, session_string = row.rpartition(':')
+            sessions.append((session_name or None, session_string, row))
+
+    return sessions
+
+
+async def validate_session(session_name: str | None, session_string: str | None, workdir: str, proxy: str | None,
+                           semaphore: asyncio.Semaphore) -> tuple[str, str]:
+    client = Client(
+        name=session_name or 'import',
+        api_id=settings.API_ID,
+        api_hash=settings.API_HASH,
+        workdir=workdir,
+        session_string=session_string,
+        proxy=get_proxy_dict(proxy=proxy),
+        no_updates=True
+    )
+
+    async def get_user():
+        if not await client.connect():
+            return None
+
+        try:
+            return await client.get_me()
+        finally:
+            await client.disconnect()
+
+    async with semaphore:
+        try:
+            user = await asyncio.wait_for(get_user(), timeout=settings.IMPORT_TIMEOUT)
+        except (Unauthorized, AuthKeyDuplicated) as error:
+            return DEAD, type(error).__name__
+        except (struct.error, binascii.Error):
+            return DEAD, "Malformed session string"
+        except Exception as error:
+            if client.is_connected:
+                with suppress(Exception):
+                    await client.disconnect()
+
+            return FAILED, f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+
+    if user is None:
+        with suppress(Exception):
+            await client.disconnect()
+
+        return DEAD, "Not authorized"
+
+    return VALID, user.username or str(user.id)
+
+
+async def import_sessions(path: str, proxies: list[str]) -> None:
+    if not settings.API_ID or not settings.API_HASH:
+        raise ValueError("API_ID and API_HASH not found in the .env file.")
+
+    sessions = read_sessions(path=path)
+
+    if not sessions:
+        raise FileNotFoundError(f"Not found sessions in {path}")
+
+    workdir = path if os.path.isdir(path) else 'sessions/'
+    proxies_cycle = cycle(proxies) if proxies else None
+    semaphore = asyncio.Semaphore(value=settings.IMPORT_CONCURRENCY)
+
+    logger.info(f"Validating {len(sessions)} sessions from {path}")
+
+    results = await asyncio.gather(*(
+        validate_session(session_name=session_name, session_string=session_string, workdir=workdir,
+                         proxy=next(proxies_cycle) if proxies_cycle else None, semaphore=semaphore)
+        for session_name, session_string, _ in sessions))
+
+    os.makedirs(QUARANTINE_DIR, exist_ok=True)
+    report = []
+
+    for (session_name, session_string, source), (status, detail) in zip(sessions, results):
+        if status == VALID:
+            session_name = session_name or detail
+
+            if session_string:
+                await session_store.save_session_string(session_name=session_name, session_string=session_string)
+            elif not os.path.samefile(workdir, 'sessions/'):
+                shutil.copy2(source, os.path.join('sessions', os.path.basename(source)))
+
+            auth_cache.set_validation(session_name=session_name, valid=True)
+        elif status == DEAD:
+            if session_string:
+                with open(file=os.path.join(QUARANTINE_DIR, 'sessions.txt'), mode='a', encoding='utf-8') as file:
+                    file.write(f'{source}\n')
+            else:
+                shutil.move(source, os.path.join(QUARANTINE_DIR, os.path.basename(source)))
+
+            if session_name:
+                auth_cache.set_validation(session_name=session_name, valid=False, reason=detail)
+
+        report.append((session_name or '', status, detail))
+
+    report_path = os.path.join('sessions', f'import-report-{strftime("%Y%m%d-%H%M%S")}.csv')
+
+    with open(file=report_path, mode='w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(('session_name', 'status', 'detail'))
+        writer.writerows(report)
+
+    for session_name, status, detail in report:
+        if status != VALID:
+            logger.warning(f"{session_name or '-'} | {status.capitalize()}: {detail}")
+
+    statuses = Counter(status for _, status, _ in report)
+    logger.success(f"Sessions imported | Valid: <g>{statuses[VALID]}</g> | Dead: <r>{statuses[DEAD]}</r> | "
+                   f"Failed: <y>{statuses[FAILED]}</y> | Report: {report_path}")
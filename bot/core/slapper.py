@@ -1,29 +1,65 @@
 import asyncio
-from time import time
+from time import time, perf_counter
+from functools import partial
+from contextlib import suppress
 from random import randint
 from datetime import datetime
 from urllib.parse import unquote
 
 import aiohttp
-from aiohttp_proxy import ProxyConnector
 from better_proxy import Proxy
-from pyrogram import Client
-from pyrogram.errors import Unauthorized, UserDeactivated, AuthKeyUnregistered
+from pyrogram.errors import Unauthorized, UserDeactivated, AuthKeyUnregistered, FloodWait
 from pyrogram.raw.functions.messages import RequestWebView
+from pyrogram.raw.types import InputPeerUser
 
 from bot.config import settings
 from bot.utils import logger
+from bot.utils.logger import get_session_logger
+from bot.utils.auth_cache import auth_cache
+from bot.utils.auth_scheduler import AuthScheduler
+from bot.utils.fleet import fleet_status
+from bot.utils.metrics import metrics
+from bot.utils.proxy_pool import proxy_pool
+from bot.utils.rate_limiter import rate_limiters
+from bot.utils.stats_store import stats_store
 from bot.utils.boosts import FreeBoosts, UpgradableBoosts
-from bot.exceptions import InvalidSession
-from .headers import headers
+from bot.utils.retry import (ErrorKind, RETRYABLE_KINDS, PROXY_FAILURE_KINDS, classify_error, get_retry_after,
+                             retry_policy, circuit_breakers)
+from bot.exceptions import InvalidSession, RequestError
+from .http_pool import http_pool
+from .tg_client import LazyClient
+from .token_manager import TokenManager, get_token_expiry
+from .game_state import BoostsCache
+from .energy import EnergyModel
+from .planner import SlapPlanner
+from .models import AccountState, Boost, DailyBoosts, Profile, SlapResult, json_loads, parse_upgradable_boosts
+from .upgrades import plan_upgrade, get_energy_stats
 
 
 class Slapper:
-    def __init__(self, tg_client: Client):
+    __slots__ = ('session_name', 'logger', 'tg_client', 'auth_scheduler', 'proxy', 'proxy_label', 'http_client',
+                 'headers', 'token_manager', 'boosts_cache', 'energy_model', 'slap_planner', 'state', 'blocking')
+
+    def __init__(self, tg_client: LazyClient, auth_scheduler: AuthScheduler, blocking: bool = True):
         self.session_name = tg_client.name
+        self.logger = get_session_logger(session_name=self.session_name)
         self.tg_client = tg_client
+        self.auth_scheduler = auth_scheduler
+        self.blocking = blocking
+        self.proxy: str | None = None
+        self.proxy_label = 'direct'
+        self.http_client: aiohttp.ClientSession | None = None
+        self.headers: dict[str, str] = {}
+        self.token_manager = TokenManager(session_name=self.session_name, headers=self.headers,
+                                          refresh=self.refresh_access_token)
+        self.boosts_cache = BoostsCache(ttl=settings.BOOSTS_CACHE_TTL)
+        self.energy_model = EnergyModel()
+        self.slap_planner = SlapPlanner()
+        self.reset()
 
     async def get_tg_web_data(self, proxy: str | None) -> str:
+        started_at = perf_counter()
+
         try:
             if proxy:
                 proxy = Proxy.from_str(proxy)
@@ -45,13 +81,17 @@ class Slapper:
                 except (Unauthorized, UserDeactivated, AuthKeyUnregistered):
                     raise InvalidSession(self.session_name)
 
+            peer = await self.get_bot_peer()
+
             web_view = await self.tg_client.invoke(RequestWebView(
-                peer=await self.tg_client.resolve_peer('wormfare_slap_bot'),
-                bot=await self.tg_client.resolve_peer('wormfare_slap_bot'),
+                peer=peer,
+                bot=peer,
                 platform='android',
                 from_bot_menu=False,
                 url='https://www.clicker.wormfare.com/'
             ))
+            metrics.observe_request(endpoint='tg:RequestWebView', proxy=self.proxy_label, status=200,
+                                    latency=perf_counter() - started_at)
 
             auth_url = web_view.url
             tg_web_data = unquote(
@@ -66,299 +106,539 @@ class Slapper:
         except InvalidSession as error:
             raise error
 
-        except Exception as error:
-            logger.error(f"{self.session_name} | Unknown error during Authorization: {error}")
-            await asyncio.sleep(delay=7)
+        except FloodWait as error:
+            metrics.observe_request(endpoint='tg:RequestWebView', proxy=self.proxy_label, status=420,
+                                    latency=perf_counter() - started_at)
 
-    async def login(self, http_client: aiohttp.ClientSession, tg_web_data: str) -> str:
-        try:
-            response = await http_client.post(
-                url='https://api.clicker.wormfare.com/auth/login',
-                json={"initData": tg_web_data})
-            response.raise_for_status()
+            if self.tg_client.is_connected:
+                await self.tg_client.disconnect()
 
-            response_json = await response.json()
-            access_token = response_json['accessToken']
+            raise error
 
-            return access_token
         except Exception as error:
-            logger.error(f"{self.session_name} | Unknown error while getting Access Token: {error}")
-            await asyncio.sleep(delay=7)
+            metrics.record_error(endpoint='tg:RequestWebView', proxy=self.proxy_label, kind=type(error).__name__)
 
-    async def get_profile_data(self, http_client: aiohttp.ClientSession) -> dict[str]:
-        try:
-            response = await http_client.get(
-                url='https://api.clicker.wormfare.com/user/profile',
-                json={})
-            response.raise_for_status()
+            if self.tg_client.is_connected:
+                with suppress(Exception):
+                    await self.tg_client.disconnect()
 
-            response_json = await response.json()
-            profile_data = response_json
+            raise RequestError(f"Authorization failed ({classify_error(error).value}): {error}") from error
 
-            return profile_data
-        except Exception as error:
-            logger.error(f"{self.session_name} | Unknown error while getting Profile Data: {error}")
-            await asyncio.sleep(delay=7)
+    async def get_bot_peer(self) -> InputPeerUser:
+        cached_peer = auth_cache.get_peer(session_name=self.session_name)
 
-    async def apply_boost(self, http_client: aiohttp.ClientSession, boost_type: FreeBoosts) -> bool:
-        try:
-            response = await http_client.post(
-                url='https://api.clicker.wormfare.com/game/activate-daily-boost',
-                json={'type': boost_type})
-            response.raise_for_status()
+        if cached_peer:
+            peer_id, access_hash = cached_peer
+            return InputPeerUser(user_id=peer_id, access_hash=access_hash)
+
+        peer = await self.tg_client.resolve_peer('wormfare_slap_bot')
+        auth_cache.set_peer(session_name=self.session_name, peer_id=peer.user_id, access_hash=peer.access_hash)
 
-            return True
+        return peer
+
+    async def authorize(self, http_client: aiohttp.ClientSession, proxy: str | None,
+                        use_cache: bool = True) -> tuple[str | None, float]:
+        access_token, expires_at = auth_cache.get_access_token(session_name=self.session_name)
+
+        if access_token and use_cache:
+            self.logger.info(f"{self.session_name} | Access Token restored from cache")
+            return access_token, expires_at
+
+        tg_web_data = auth_cache.get_tg_web_data(session_name=self.session_name)
+
+        if not tg_web_data:
+            tg_web_data = await self.auth_scheduler.authorize(
+                session_name=self.session_name, get_tg_web_data=partial(self.get_tg_web_data, proxy=proxy),
+                wait=self.blocking)
+
+            if not tg_web_data:
+                return None, 0
+
+            auth_cache.set_tg_web_data(session_name=self.session_name, tg_web_data=tg_web_data,
+                                       expires_at=time() + settings.TG_WEB_DATA_TTL)
+
+        try:
+            access_token = await self.login(http_client=http_client, tg_web_data=tg_web_data)
         except Exception as error:
-            logger.error(f"{self.session_name} | Unknown error when Apply {boost_type} Boost: {error}")
-            await asyncio.sleep(delay=7)
+            auth_cache.invalidate(session_name=self.session_name)
+            raise error
+
+        expires_at = get_token_expiry(access_token=access_token) or time() + settings.ACCESS_TOKEN_TTL
+        auth_cache.set_access_token(session_name=self.session_name, access_token=access_token, expires_at=expires_at)
+
+        return access_token, expires_at
+
+    async def update_access_token(self) -> bool:
+        access_token, expires_at = await self.authorize(http_client=self.http_client, proxy=self.proxy)
 
+        if not access_token:
             return False
 
+        self.token_manager.set_token(access_token=access_token, expires_at=expires_at)
+        self.token_manager.start()
+
+        return True
+
+    async def refresh_access_token(self) -> tuple[str | None, float]:
+        return await self.authorize(http_client=self.http_client, proxy=self.proxy, use_cache=False)
+
+    async def request(self, http_client: aiohttp.ClientSession, method: str, endpoint: str, json: dict,
+                      parse_json: bool = True):
+        circuit_breaker = circuit_breakers.get(proxy=self.proxy_label)
+        rate_limiter = rate_limiters.get(proxy=self.proxy_label)
+        token_refreshed = False
+        attempt = 0
+
+        while True:
+            probe = circuit_breaker.is_open
+
+            if not circuit_breaker.allow():
+                raise RequestError(f"{method} {endpoint} skipped: proxy {self.proxy_label} is unavailable",
+                                   retry_after=circuit_breaker.retry_after)
+
+            started_at = perf_counter()
+
+            try:
+                if settings.USE_RATE_LIMITER:
+                    await rate_limiter.acquire()
+                    started_at = perf_counter()
+
+                response = await http_client.request(method=method, url=f'{settings.API_URL}{endpoint}', json=json,
+                                                     headers=self.headers)
+                metrics.observe_request(endpoint=endpoint, proxy=self.proxy_label, status=response.status,
+                                        latency=perf_counter() - started_at)
+                response.raise_for_status()
+
+                response_json = json_loads(await response.read()) if parse_json else None
+            except asyncio.CancelledError:
+                if probe:
+                    circuit_breaker.cancel_probe()
+
+                raise
+            except Exception as error:
+                error_kind = classify_error(error)
+                metrics.record_error(endpoint=endpoint, proxy=self.proxy_label, kind=error_kind.value)
+
+                if error_kind in PROXY_FAILURE_KINDS:
+                    circuit_breaker.record_failure()
+                    proxy_pool.record_failure(proxy=self.proxy)
+                else:
+                    circuit_breaker.record_success()
+                    proxy_pool.record_success(proxy=self.proxy)
+
+                if error_kind in (ErrorKind.RATE_LIMIT, ErrorKind.SERVER):
+                    rate_limiter.record_throttle(retry_after=get_retry_after(error))
+
+                if error_kind == ErrorKind.UNAUTHORIZED and endpoint != '/auth/login' and not token_refreshed:
+                    self.logger.warning(f"{self.session_name} | Access Token rejected, refreshing")
+                    auth_cache.invalidate(session_name=self.session_name)
+
+                    token_refreshed = True
+                    if await self.update_access_token():
+                        continue
+
+                attempt += 1
+                if error_kind not in RETRYABLE_KINDS or attempt >= retry_policy.attempts or not self.blocking:
+                    raise RequestError(f"{method} {endpoint} failed ({error_kind.value}): {error}",
+                                       retry_after=get_retry_after(error)) from error
+
+                metrics.record_retry(endpoint=endpoint, proxy=self.proxy_label)
+                await asyncio.sleep(delay=retry_policy.get_delay(attempt=attempt - 1, error=error))
+
+                continue
+
+            circuit_breaker.record_success()
+            proxy_pool.record_success(proxy=self.proxy)
+            rate_limiter.record_success()
+
+            return response_json
+
+    async def login(self, http_client: aiohttp.ClientSession, tg_web_data: str) -> str:
+        response_json = await self.request(http_client=http_client, method='POST',
+                                           endpoint='/auth/login', json={"initData": tg_web_data})
+        access_token = response_json['accessToken']
+
+        return access_token
+
+    async def get_profile_data(self, http_client: aiohttp.ClientSession) -> Profile:
+        response_json = await self.request(http_client=http_client, method='GET',
+                                           endpoint='/user/profile', json={})
+        profile = Profile.from_json(response_json)
+
+        return profile
+
+    async def apply_boost(self, http_client: aiohttp.ClientSession, boost_type: FreeBoosts) -> bool:
+        await self.request(http_client=http_client, method='POST', endpoint='/game/activate-daily-boost',
+                           json={'type': boost_type}, parse_json=False)
+
+        return True
+
     async def upgrade_boost(self, http_client: aiohttp.ClientSession, boost_type: UpgradableBoosts) -> bool:
-        try:
-            response = await http_client.post(
-                url='https://api.clicker.wormfare.com/game/buy-boost',
-                json={'type': boost_type})
-            response.raise_for_status()
+        await self.request(http_client=http_client, method='POST', endpoint='/game/buy-boost',
+                           json={'type': boost_type}, parse_json=False)
 
-            return True
-        except Exception as error:
-            logger.error(f"{self.session_name} | Unknown error when Upgrade {boost_type} Boost: {error}")
-            await asyncio.sleep(delay=7)
+        return True
 
-            return False
+    async def get_daily_boosts(self, http_client: aiohttp.ClientSession) -> DailyBoosts:
+        response_json = await self.request(http_client=http_client, method='GET',
+                                           endpoint='/game/daily-boosts', json={})
+        daily_boosts = DailyBoosts.from_json(response_json)
 
-    async def get_daily_boosts(self, http_client: aiohttp.ClientSession) -> tuple[int, int]:
-        try:
-            response = await http_client.get(
-                url='https://api.clicker.wormfare.com/game/daily-boosts',
-                json={})
-            response.raise_for_status()
+        return daily_boosts
 
-            response_json = await response.json()
+    async def get_upgradable_boosts(self, http_client: aiohttp.ClientSession) -> dict[str, Boost]:
+        response_json = await self.request(http_client=http_client, method='GET',
+                                           endpoint='/game/available-boosts', json={})
+        upgradable_boosts = parse_upgradable_boosts(response_json)
 
-            turbo_count = response_json[1]['availableCount']
-            energy_count = response_json[0]['availableCount']
+        return upgradable_boosts
 
-            return turbo_count, energy_count
-        except Exception as error:
-            logger.error(f"{self.session_name} | Unknown error when getting Daily Boosts: {error}")
-            await asyncio.sleep(delay=7)
+    async def get_boosts(self, http_client: aiohttp.ClientSession) -> tuple[DailyBoosts, dict[str, Boost]]:
+        self.boosts_cache.ttl = settings.BOOSTS_CACHE_TTL
+        cached_boosts = self.boosts_cache.get()
 
-            return 0, 0
+        if cached_boosts:
+            return cached_boosts
 
-    async def get_upgradable_boosts(self, http_client: aiohttp.ClientSession) -> list[dict[str]]:
-        try:
-            response = await http_client.get(
-                url='https://api.clicker.wormfare.com/game/available-boosts',
-                json={})
-            response.raise_for_status()
+        daily_boosts = await self.get_daily_boosts(http_client=http_client)
+        upgradable_boosts = await self.get_upgradable_boosts(http_client=http_client)
 
-            response_json = await response.json()
-            upgradable_boosts = response_json
+        self.boosts_cache.update(daily_boosts=daily_boosts, upgradable_boosts=upgradable_boosts)
 
-            return upgradable_boosts
-        except Exception as error:
-            logger.error(f"{self.session_name} | Unknown error when getting Upgradable Boosts: {error}")
-            await asyncio.sleep(delay=7)
+        return daily_boosts, upgradable_boosts
 
-    async def send_slaps(self, http_client: aiohttp.ClientSession, slaps: int, active_turbo: bool) -> dict[str]:
-        try:
-            timestamp = (round(datetime.timestamp(datetime.now()), 3) - 10) * 1000
-            response = await http_client.post(
-                url='https://api.clicker.wormfare.com/game/save-clicks',
-                json={'amount': slaps, 'isTurbo': active_turbo, 'startTimestamp': timestamp})
-            response.raise_for_status()
+    async def send_slaps(self, http_client: aiohttp.ClientSession, slaps: int, active_turbo: bool,
+                         duration: float = 10) -> SlapResult:
+        timestamp = round((datetime.timestamp(datetime.now()) - duration) * 1000)
+        response_json = await self.request(http_client=http_client, method='POST', endpoint='/game/save-clicks',
+                                           json={'amount': slaps, 'isTurbo': active_turbo,
+                                                 'startTimestamp': timestamp})
+        slap_result = SlapResult.from_json(response_json)
 
-            response_json = await response.json()
-            player_data = response_json
+        return slap_result
 
-            return player_data
-        except Exception as error:
-            logger.error(f"{self.session_name} | Unknown error when Slapping: {error}")
-            await asyncio.sleep(delay=7)
+    def get_sleep_time(self, slap_level: int, default: int) -> int:
+        if not settings.USE_ENERGY_SCHEDULER:
+            return default
 
-    async def check_proxy(self, http_client: aiohttp.ClientSession, proxy: Proxy) -> None:
-        try:
-            response = await http_client.get(url='https://httpbin.org/ip', timeout=aiohttp.ClientTimeout(5))
-            ip = (await response.json()).get('origin')
-            logger.info(f"{self.session_name} | Proxy IP: {ip}")
-        except Exception as error:
-            logger.error(f"{self.session_name} | Proxy: {proxy} | Error: {error}")
+        if self.energy_model.max_energy:
+            target_energy = self.energy_model.max_energy * settings.ENERGY_TARGET_PERCENT / 100
+        else:
+            target_energy = settings.RANDOM_SLAPS_COUNT[1] * slap_level
 
-    async def run(self, proxy: str | None) -> None:
-        access_token_created_time = 0
-        active_turbo = False
+        sleep_time = self.energy_model.seconds_until(target=target_energy)
 
-        proxy_conn = ProxyConnector().from_url(proxy) if proxy else None
+        if sleep_time is None:
+            return default
 
-        async with aiohttp.ClientSession(headers=headers, connector=proxy_conn) as http_client:
-            if proxy:
-                await self.check_proxy(http_client=http_client, proxy=proxy)
+        min_sleep_time = settings.SLEEP_BETWEEN_SLAP[0]
 
-            while True:
-                try:
-                    if time() - access_token_created_time >= 3600:
-                        tg_web_data = await self.get_tg_web_data(proxy=proxy)
-                        access_token = await self.login(http_client=http_client, tg_web_data=tg_web_data)
+        if settings.USE_SLAP_PLANNER:
+            spend_time = self.slap_planner.get_spend_time(energy=self.energy_model.predict(), slap_level=slap_level)
+            min_sleep_time = max(min_sleep_time, spend_time)
 
-                        http_client.headers["Authorization"] = f"Bearer {access_token}"
-                        headers["Authorization"] = f"Bearer {access_token}"
+        sleep_time = min(max(sleep_time, min_sleep_time), settings.MAX_SLEEP_BY_ENERGY)
 
-                        access_token_created_time = time()
+        return round(sleep_time) + randint(a=settings.SLEEP_JITTER[0], b=settings.SLEEP_JITTER[1])
 
-                        profile_data = await self.get_profile_data(http_client=http_client)
+    def reset(self) -> None:
+        self.state = AccountState()
 
-                        balance = profile_data['score']
+        self.token_manager.clear()
+        self.boosts_cache.invalidate()
+        self.slap_planner.reset()
 
-                        slap_level = profile_data['energyPerTap']
+    def set_proxy(self, proxy: str | None) -> None:
+        self.proxy = proxy
+        self.proxy_label = 'direct'
 
-                        earned_for_today = profile_data['earnedScoreToday']
-                        earned_for_week = profile_data['earnedScoreThisWeek']
+        if proxy:
+            proxy_info = Proxy.from_str(proxy)
+            self.proxy_label = f'{proxy_info.host}:{proxy_info.port}'
 
-                        rank = profile_data['rank']
+        self.http_client = http_pool.get_session(proxy=proxy)
 
-                        logger.info(f"{self.session_name} | Balance: <c>{balance}</c> | Rank: <m>{rank}</m>")
+    def check_proxy(self) -> None:
+        if not self.proxy or proxy_pool.is_healthy(proxy=self.proxy):
+            return
 
-                        logger.info(f"{self.session_name} | Earned today: <g>+{earned_for_today}</g>")
-                        logger.info(f"{self.session_name} | Earned week: <g>+{earned_for_week}</g>")
+        proxy = proxy_pool.assign(session_name=self.session_name)
 
-                    slaps = randint(a=settings.RANDOM_SLAPS_COUNT[0], b=settings.RANDOM_SLAPS_COUNT[1])
+        if proxy != self.proxy:
+            previous_proxy_label = self.proxy_label
+            self.set_proxy(proxy=proxy)
 
-                    if active_turbo:
-                        slaps += settings.ADD_SLAPS_ON_TURBO
+            self.logger.warning(f"{self.session_name} | Proxy {previous_proxy_label} is unhealthy, "
+                                f"switched to {self.proxy_label}")
 
-                    slaps *= slap_level
+    async def start(self, proxy: str | None) -> None:
+        self.set_proxy(proxy=proxy_pool.assign(session_name=self.session_name, preferred=proxy))
+        self.reset()
 
-                    player_data = await self.send_slaps(http_client=http_client, slaps=slaps, active_turbo=active_turbo)
+        if self.proxy:
+            self.logger.info(f"{self.session_name} | Proxy: {self.proxy_label}")
 
-                    if not player_data:
-                        continue
+    async def activate_boost(self, boost_type: FreeBoosts) -> int:
+        await self.apply_boost(http_client=self.http_client, boost_type=boost_type)
+
+        self.boosts_cache.invalidate()
 
-                    available_energy = player_data['energyLeft']
-                    new_balance = player_data['score']
-                    calc_slaps = new_balance - balance
-                    balance = new_balance
-                    total = player_data['totalEarnedScore']
-                    slap_level = profile_data['energyPerTap']
+        if boost_type == FreeBoosts.ENERGY:
+            self.energy_model.refill()
+            self.logger.success(f"{self.session_name} | Energy boost applied")
 
-                    daily_turbo_count, daily_energy_count = await self.get_daily_boosts(http_client=http_client)
+            if settings.USE_SLAP_PLANNER:
+                return max(self.slap_planner.get_spend_time(energy=self.energy_model.predict(),
+                                                            slap_level=self.state.slap_level), 5)
+        else:
+            self.state.active_turbo = True
+            self.slap_planner.start_turbo()
+            self.logger.success(f"{self.session_name} | Turbo boost applied")
 
-                    upgradable_boosts = await self.get_upgradable_boosts(http_client=http_client)
+        return 5
 
-                    next_slap_price = upgradable_boosts[2]['priceInScore']
-                    next_slap_level = upgradable_boosts[2]['level']
-                    next_energy_level = upgradable_boosts[0]['level']
-                    next_energy_price = upgradable_boosts[0]['priceInScore']
-                    next_charge_level = upgradable_boosts[1]['level']
-                    next_charge_price = upgradable_boosts[1]['priceInScore']
+    async def buy_upgrade(self, boost_type: UpgradableBoosts, level: int) -> int:
+        await self.upgrade_boost(http_client=self.http_client, boost_type=boost_type)
 
-                    logger.success(f"{self.session_name} | Successful slapped! | "
-                                   f"Balance: <c>{balance}</c> (<g>+{calc_slaps}</g>) | Total: <e>{total}</e>")
+        self.boosts_cache.invalidate()
+        self.logger.success(f"{self.session_name} | {boost_type.name.capitalize()} upgraded to {level} lvl")
 
-                    if active_turbo is False:
-                        if (daily_energy_count > 0
-                                and available_energy < settings.MIN_AVAILABLE_ENERGY
-                                and settings.APPLY_DAILY_ENERGY is True):
-                            logger.info(f"{self.session_name} | Sleep 5s before activating the daily energy boost")
-                            await asyncio.sleep(delay=5)
+        if boost_type == UpgradableBoosts.ENERGY:
+            self.energy_model.scale(max_energy=level / max(level - 1, 1))
+        elif boost_type == UpgradableBoosts.CHARGE:
+            self.energy_model.scale(per_second=level / max(level - 1, 1))
 
-                            status = await self.apply_boost(http_client=http_client, boost_type=FreeBoosts.ENERGY)
-                            if status is True:
-                                logger.success(f"{self.session_name} | Energy boost applied")
+        self.state.profile = await self.get_profile_data(http_client=self.http_client)
+        self.state.balance = self.state.profile.score
+        self.state.slap_level = self.state.profile.energy_per_tap
+        self.energy_model.update_from_profile(profile=self.state.profile)
 
-                                await asyncio.sleep(delay=5)
+        return 5
 
-                            continue
+    def get_next_upgrade(self, daily_boosts: DailyBoosts,
+                         upgradable_boosts: dict[str, Boost]) -> tuple[UpgradableBoosts, int] | None:
+        stats = None
 
-                        if daily_turbo_count > 0 and settings.APPLY_DAILY_TURBO is True:
-                            logger.info(f"{self.session_name} | Sleep 5s before activating the daily turbo boost")
-                            await asyncio.sleep(delay=5)
+        if settings.USE_UPGRADE_PLANNER and self.state.profile:
+            stats = get_energy_stats(profile=self.state.profile, energy_max=self.energy_model.peak_energy,
+                                     energy_per_second=self.energy_model.per_second)
 
-                            status = await self.apply_boost(http_client=http_client, boost_type=FreeBoosts.TURBO)
-                            if status is True:
-                                logger.success(f"{self.session_name} | Turbo boost applied")
+        if stats:
+            max_levels = {}
 
-                                await asyncio.sleep(delay=5)
+            if settings.AUTO_UPGRADE_SLAP is True:
+                max_levels[UpgradableBoosts.SLAP] = settings.MAX_SLAP_LEVEL
+            if settings.AUTO_UPGRADE_ENERGY is True:
+                max_levels[UpgradableBoosts.ENERGY] = settings.MAX_ENERGY_LEVEL
+            if settings.AUTO_UPGRADE_CHARGE is True:
+                max_levels[UpgradableBoosts.CHARGE] = settings.MAX_CHARGE_LEVEL
 
-                                active_turbo = True
+            upgrade = plan_upgrade(stats=stats, upgradable_boosts=upgradable_boosts,
+                                   daily_boosts=daily_boosts, max_levels=max_levels,
+                                   turbo_slaps=settings.ADD_SLAPS_ON_TURBO if settings.APPLY_DAILY_TURBO else 0,
+                                   slaps_per_second=sum(settings.SLAPS_PER_SECOND) / 2,
+                                   max_slaps_per_request=settings.MAX_SLAPS_PER_REQUEST,
+                                   max_payback=settings.UPGRADE_MAX_PAYBACK,
+                                   request_weight=settings.UPGRADE_REQUEST_WEIGHT)
 
-                            continue
+            if not upgrade:
+                return None
 
-                        if (settings.AUTO_UPGRADE_SLAP is True
-                                and balance > next_slap_price
-                                and next_slap_level <= settings.MAX_SLAP_LEVEL):
-                            logger.info(f"{self.session_name} | Sleep 5s before upgrade slap to {next_slap_level} lvl")
-                            await asyncio.sleep(delay=5)
+            boost_type = UpgradableBoosts(upgrade['type'])
 
-                            status = await self.upgrade_boost(http_client=http_client,
-                                                              boost_type=UpgradableBoosts.SLAP)
-                            if status is True:
-                                logger.success(f"{self.session_name} | Slap upgraded to {next_slap_level} lvl")
+            if self.state.balance < upgrade['price']:
+                if self.state.upgrade_target != (boost_type, upgrade['level']):
+                    self.state.upgrade_target = (boost_type, upgrade['level'])
+                    self.logger.info(f"{self.session_name} | Saving up for {boost_type.name.lower()} "
+                                     f"{upgrade['level']} lvl: <c>{upgrade['price']}</c> "
+                                     f"(+{round(upgrade['gain'])}/h, pays back in {upgrade['payback']:.1f}h)")
 
-                                await asyncio.sleep(delay=5)
+                return None
 
-                            continue
+            return boost_type, upgrade['level']
 
-                        if (settings.AUTO_UPGRADE_ENERGY is True
-                                and balance > next_energy_price
-                                and next_energy_level <= settings.MAX_ENERGY_LEVEL):
-                            logger.info(
-                                f"{self.session_name} | Sleep 5s before upgrade energy to {next_energy_level} lvl")
-                            await asyncio.sleep(delay=5)
+        for boost_type, auto_upgrade, max_level in (
+                (UpgradableBoosts.SLAP, settings.AUTO_UPGRADE_SLAP, settings.MAX_SLAP_LEVEL),
+                (UpgradableBoosts.ENERGY, settings.AUTO_UPGRADE_ENERGY, settings.MAX_ENERGY_LEVEL),
+                (UpgradableBoosts.CHARGE, settings.AUTO_UPGRADE_CHARGE, settings.MAX_CHARGE_LEVEL)):
+            boost = upgradable_boosts.get(boost_type)
 
-                            status = await self.upgrade_boost(http_client=http_client,
-                                                              boost_type=UpgradableBoosts.ENERGY)
-                            if status is True:
-                                logger.success(f"{self.session_name} | Energy upgraded to {next_energy_level} lvl")
+            if (auto_upgrade is True
+                    and boost is not None
+                    and self.state.balance > boost.price
+                    and boost.level <= max_level):
+                return boost_type, boost.level
 
-                                await asyncio.sleep(delay=5)
+        return None
 
-                            continue
+    async def step(self) -> int:
+        try:
+            self.check_proxy()
+
+            if self.state.next_action:
+                next_action, self.state.next_action = self.state.next_action, None
 
-                        if (settings.AUTO_UPGRADE_CHARGE is True
-                                and balance > next_charge_price
-                                and next_charge_level <= settings.MAX_CHARGE_LEVEL):
-                            logger.info(
-                                f"{self.session_name} | Sleep 5s before upgrade charge to {next_charge_level} lvl")
-                            await asyncio.sleep(delay=5)
+                return await next_action()
 
-                            status = await self.upgrade_boost(http_client=http_client,
-                                                              boost_type=UpgradableBoosts.CHARGE)
-                            if status is True:
-                                logger.success(f"{self.session_name} | Charge upgraded to {next_charge_level} lvl")
+            if not self.token_manager.is_valid:
+                if not await self.update_access_token():
+                    raise RequestError("Authorization failed: Access Token not received")
 
-                                await asyncio.sleep(delay=5)
+                profile = await self.get_profile_data(http_client=self.http_client)
 
-                            continue
+                self.auth_scheduler.mark_active(session_name=self.session_name)
+                fleet_status.mark_active(session_name=self.session_name)
+                self.energy_model.update_from_profile(profile=profile)
 
-                        if available_energy < settings.MIN_AVAILABLE_ENERGY:
-                            logger.info(f"{self.session_name} | Minimum energy reached: {available_energy}")
-                            logger.info(f"{self.session_name} | Sleep {settings.SLEEP_BY_MIN_ENERGY}s")
+                self.state.profile = profile
+                self.state.balance = profile.score
+                self.state.slap_level = profile.energy_per_tap
 
-                            await asyncio.sleep(delay=settings.SLEEP_BY_MIN_ENERGY)
+                self.logger.info(f"{self.session_name} | Balance: <c>{self.state.balance}</c> | "
+                                 f"Rank: <m>{profile.rank}</m>")
 
-                            continue
+                self.logger.info(f"{self.session_name} | Earned today: <g>+{profile.earned_today}</g>")
+                self.logger.info(f"{self.session_name} | Earned week: <g>+{profile.earned_week}</g>")
 
-                except InvalidSession as error:
-                    raise error
+            if settings.USE_SLAP_PLANNER:
+                self.state.active_turbo = self.state.active_turbo and self.slap_planner.is_turbo_active()
+                slaps, duration = self.slap_planner.plan(energy=self.energy_model.predict(),
+                                                         slap_level=self.state.slap_level)
+            else:
+                slaps = randint(a=settings.RANDOM_SLAPS_COUNT[0], b=settings.RANDOM_SLAPS_COUNT[1])
+                duration = 10
 
-                except Exception as error:
-                    logger.error(f"{self.session_name} | Unknown error: {error}")
-                    await asyncio.sleep(delay=7)
+                if self.state.active_turbo:
+                    slaps += settings.ADD_SLAPS_ON_TURBO
 
-                else:
-                    sleep_between_clicks = randint(a=settings.SLEEP_BETWEEN_SLAP[0], b=settings.SLEEP_BETWEEN_SLAP[1])
+            slaps *= self.state.slap_level
+
+            slap_result = await self.send_slaps(http_client=self.http_client, slaps=slaps,
+                                                active_turbo=self.state.active_turbo, duration=duration)
+
+            available_energy = slap_result.energy_left
+            self.energy_model.observe(energy_left=available_energy, spent=0 if self.state.active_turbo else slaps)
+            calc_slaps = slap_result.score - self.state.balance
+            self.state.balance = slap_result.score
+            fleet_status.record_slap(earned=calc_slaps)
+
+            daily_boosts, upgradable_boosts = await self.get_boosts(http_client=self.http_client)
+
+            boost_levels = {f'{boost_type.name.lower()}_level': upgradable_boosts[boost_type].level - 1
+                            for boost_type in UpgradableBoosts if boost_type in upgradable_boosts}
+
+            metrics.set_account(session_name=self.session_name, balance=self.state.balance, energy=available_energy,
+                                boosts_cache_hits=self.boosts_cache.hits, boosts_cache_misses=self.boosts_cache.misses,
+                                **boost_levels)
+
+            profile = self.state.profile
+            stats_store.record(session_name=self.session_name, balance=self.state.balance,
+                               total_earned=slap_result.total_earned, energy=available_energy,
+                               rank=profile.rank if profile else None,
+                               earned_today=profile.earned_today if profile else None,
+                               earned_week=profile.earned_week if profile else None, **boost_levels)
+
+            self.logger.success(f"{self.session_name} | Successful slapped! | "
+                                f"Balance: <c>{self.state.balance}</c> (<g>+{calc_slaps}</g>) | "
+                                f"Total: <e>{slap_result.total_earned}</e>")
+
+            if self.state.active_turbo is False:
+                if (daily_boosts.energy > 0
+                        and available_energy < settings.MIN_AVAILABLE_ENERGY
+                        and settings.APPLY_DAILY_ENERGY is True):
+                    self.logger.info(f"{self.session_name} | Sleep 5s before activating the daily energy boost")
+                    self.state.next_action = partial(self.activate_boost, boost_type=FreeBoosts.ENERGY)
+
+                    return 5
+
+                if daily_boosts.turbo > 0 and settings.APPLY_DAILY_TURBO is True:
+                    self.logger.info(f"{self.session_name} | Sleep 5s before activating the daily turbo boost")
+                    self.state.next_action = partial(self.activate_boost, boost_type=FreeBoosts.TURBO)
+
+                    return 5
 
-                    if active_turbo is True:
-                        active_turbo = False
+                next_upgrade = self.get_next_upgrade(daily_boosts=daily_boosts, upgradable_boosts=upgradable_boosts)
 
-                    logger.info(f"Sleep {sleep_between_clicks}s")
-                    await asyncio.sleep(delay=sleep_between_clicks)
+                if next_upgrade:
+                    boost_type, level = next_upgrade
 
+                    self.logger.info(f"{self.session_name} | Sleep 5s before upgrade {boost_type.name.lower()} "
+                                     f"to {level} lvl")
+                    self.state.next_action = partial(self.buy_upgrade, boost_type=boost_type, level=level)
+
+                    return 5
+
+                if available_energy < settings.MIN_AVAILABLE_ENERGY:
+                    sleep_by_min_energy = self.get_sleep_time(slap_level=self.state.slap_level,
+                                                              default=settings.SLEEP_BY_MIN_ENERGY)
+
+                    self.logger.info(f"{self.session_name} | Minimum energy reached: {available_energy}")
+                    self.logger.info(f"{self.session_name} | Sleep {sleep_by_min_energy}s")
+
+                    return sleep_by_min_energy
+
+        except InvalidSession as error:
+            raise error
+
+        except Exception as error:
+            self.state.failures += 1
+            fleet_status.record_error()
+            self.logger.error(f"{self.session_name} | Unknown error: {error}")
+
+            if isinstance(error, RequestError) and error.retry_after is not None:
+                return max(round(error.retry_after), 1)
+
+            return max(round(retry_policy.get_delay(attempt=self.state.failures)), 1)
+
+        self.state.failures = 0
+
+        if self.state.active_turbo is True and settings.USE_SLAP_PLANNER:
+            turbo_delay = self.slap_planner.get_turbo_delay()
+
+            if turbo_delay is not None:
+                self.logger.info(f"{self.session_name} | Sleep {turbo_delay}s before the next turbo slaps")
+
+                return turbo_delay
+
+        sleep_between_clicks = self.get_sleep_time(
+            slap_level=self.state.slap_level,
+            default=randint(a=settings.SLEEP_BETWEEN_SLAP[0], b=settings.SLEEP_BETWEEN_SLAP[1]))
+
+        if self.state.active_turbo is True:
+            self.state.active_turbo = False
+
+        self.logger.info(f"{self.session_name} | Sleep {sleep_between_clicks}s")
+
+        return sleep_between_clicks
+
+    async def run(self, proxy: str | None) -> None:
+        await self.start(proxy=proxy)
+
+        try:
+            while True:
+                await asyncio.sleep(delay=await self.step())
+        finally:
+            self.token_manager.stop()
+
+
+async def run_slapper(tg_client: LazyClient, proxy: str | None, auth_scheduler: AuthScheduler):
+    restarts = 0
+
+    while True:
+        try:
+            await Slapper(tg_client=tg_client, auth_scheduler=auth_scheduler).run(proxy=proxy)
+        except InvalidSession:
+            auth_scheduler.mark_failed(session_name=tg_client.name)
+            fleet_status.mark_failed(session_name=tg_client.name)
+            metrics.remove_account(session_name=tg_client.name)
+            proxy_pool.release(session_name=tg_client.name)
+            auth_cache.set_validation(session_name=tg_client.name, valid=False, reason='InvalidSession')
+            logger.error(f"{tg_client.name} | Invalid Session")
+
+            return
+        except Exception as error:
+            restarts += 1
+            restart_delay = min(settings.RESTART_DELAY * 2 ** (restarts - 1), 600)
 
-async def run_slapper(tg_client: Client, proxy: str | None):
-    try:
-        await Slapper(tg_client=tg_client).run(proxy=proxy)
-    except InvalidSession:
-        logger.error(f"{tg_client.name} | Invalid Session")
+            logger.error(f"{tg_client.name} | Crashed: {error} | Restart in {restart_delay}s")
+            await asyncio.sleep(delay=restart_delay)
@@ -0,0 +1,54 @@
+from pyrogram import Client
+
+from bot.config import settings
+
+
+class LazyClient:
+    """Stands in for a Pyrogram client and builds it only when Telegram is actually needed."""
+
+    __slots__ = ('name', 'session_string', '_client')
+
+    def __init__(self, name: str, session_string: str | None = None):
+        self.name = name
+        self.session_string = session_string
+        self._client: Client | None = None
+
+    @property
+    def client(self) -> Client:
+        if self._client is None:
+            self._client = Client(
+                name=self.name,
+                api_id=settings.API_ID,
+                api_hash=settings.API_HASH,
+                workdir='sessions/',
+                session_string=self.session_string,
+                plugins=dict(root='bot/plugins')
+            )
+
+        return self._client
+
+    @property
+    def is_connected(self) -> bool:
+        return self._client is not None and bool(self._client.is_connected)
+
+    @property
+    def proxy(self) -> dict | None:
+        return self._client.proxy if self._client is not None else None
+
+    @proxy.setter
+    def proxy(self, proxy: dict | None) -> None:
+        self.client.proxy = proxy
+
+    async def connect(self) -> bool:
+        return await self.client.connect()
+
+    async def disconnect(self) -> None:
+        if self._client is not None:
+            await self._client.disconnect()
+            self._client = None
+
+    async def invoke(self, query):
+        return await self.client.invoke(query)
+
+    async def resolve_peer(self, peer_id: int | str):
+        return await self.client.resolve_peer(peer_id)
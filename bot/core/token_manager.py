@@ -0,0 +1,105 @@
+import json
+import asyncio
+import base64
+from time import time
+from random import uniform
+from typing import Awaitable, Callable
+
+from bot.config import settings
+from bot.utils import logger
+from bot.utils.retry import retry_policy
+from bot.exceptions import InvalidSession
+
+
+MIN_REFRESH_INTERVAL = 10
+
+
+def get_token_expiry(access_token: str) -> float | None:
+    try:
+        payload = access_token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+
+        return float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenManager:
+    __slots__ = ('session_name', 'headers', 'refresh', 'scheduler', 'expires_at', 'refresh_at', 'failures', 'task')
+
+    def __init__(self, session_name: str, headers: dict[str, str],
+                 refresh: Callable[[], Awaitable[tuple[str | None, float]]]):
+        self.session_name = session_name
+        self.headers = headers
+        self.refresh = refresh
+        self.scheduler: Callable[[float], None] | None = None
+
+        self.expires_at = 0
+        self.refresh_at = 0
+        self.failures = 0
+        self.task: asyncio.Task | None = None
+
+    @property
+    def is_valid(self) -> bool:
+        return "Authorization" in self.headers and time() < self.expires_at
+
+    def set_token(self, access_token: str, expires_at: float) -> None:
+        self.headers["Authorization"] = f"Bearer {access_token}"
+        self.expires_at = expires_at
+
+        now = time()
+        lead_time = min(settings.TOKEN_REFRESH_MARGIN + uniform(0, settings.TOKEN_REFRESH_SPREAD),
+                        (expires_at - now) / 2)
+        self.refresh_at = max(expires_at - lead_time, now + MIN_REFRESH_INTERVAL)
+
+    def start(self) -> None:
+        if self.scheduler is not None:
+            self.scheduler(self.refresh_at)
+        elif self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self) -> None:
+        self.refresh_at = float('inf')
+
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def clear(self) -> None:
+        self.stop()
+        self.headers.pop("Authorization", None)
+        self.expires_at = 0
+        self.failures = 0
+
+    async def refresh_token(self) -> bool:
+        if time() >= self.expires_at:
+            return False
+
+        try:
+            access_token, expires_at = await self.refresh()
+        except InvalidSession:
+            return False
+        except Exception as error:
+            access_token, expires_at = None, 0
+            logger.warning(f"{self.session_name} | Background token refresh failed: {error}")
+
+        if access_token:
+            self.failures = 0
+            self.set_token(access_token=access_token, expires_at=expires_at)
+            return True
+
+        self.failures += 1
+        retry_at = time() + retry_policy.get_delay(attempt=self.failures)
+
+        if retry_at >= self.expires_at:
+            return False
+
+        self.refresh_at = retry_at
+        return True
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(delay=max(self.refresh_at - time(), 0))
+
+            if not await self.refresh_token():
+                return
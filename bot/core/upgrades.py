@@ -0,0 +1,106 @@
+from functools import lru_cache
+
+from .models import Boost, DailyBoosts, Profile
+
+
+SLAP = 'energy_per_tap'
+ENERGY = 'energy_max'
+CHARGE = 'energy_per_second'
+
+
+@lru_cache(maxsize=4096)
+def get_score_per_hour(energy_per_tap: float, energy_max: float, energy_per_second: float,
+                       daily_energy: int, daily_turbo: int, turbo_slaps: int, slaps_per_second: float) -> float:
+    energy_per_hour = energy_per_second * 3600 + daily_energy * energy_max / 24
+    slaps_limit = slaps_per_second * energy_per_tap * 3600
+    turbo_per_hour = daily_turbo * turbo_slaps * energy_per_tap / 24
+
+    return min(energy_per_hour, slaps_limit) + turbo_per_hour
+
+
+@lru_cache(maxsize=4096)
+def get_requests_per_hour(energy_per_tap: float, energy_max: float, energy_per_second: float,
+                          max_slaps_per_request: int) -> float:
+    energy_per_request = min(energy_max, max_slaps_per_request * energy_per_tap)
+
+    return energy_per_second * 3600 / max(energy_per_request, 1)
+
+
+def get_energy_stats(profile: Profile, energy_max: float | None,
+                     energy_per_second: float | None) -> dict[str, float] | None:
+    stats = {
+        SLAP: profile.energy_per_tap,
+        ENERGY: profile.energy_max or energy_max,
+        CHARGE: profile.energy_per_second or energy_per_second,
+    }
+
+    return stats if all(stats.values()) else None
+
+
+def get_upgraded_stats(stats: dict[str, float], boost_type: str, level: int) -> dict[str, float]:
+    current_level = max(level - 1, 1)
+
+    upgraded_stats = dict(stats)
+    upgraded_stats[boost_type] = stats[boost_type] * (current_level + 1) / current_level
+
+    return upgraded_stats
+
+
+def plan_upgrade(stats: dict[str, float], upgradable_boosts: dict[str, Boost], daily_boosts: DailyBoosts,
+                 max_levels: dict[str, int], turbo_slaps: int, slaps_per_second: float,
+                 max_slaps_per_request: int, max_payback: float, request_weight: float) -> dict[str] | None:
+    daily_turbo, daily_energy = daily_boosts.turbo, daily_boosts.energy
+
+    def score_per_hour(values: dict[str, float]) -> float:
+        return get_score_per_hour(values[SLAP], values[ENERGY], values[CHARGE], daily_energy, daily_turbo,
+                                  turbo_slaps, slaps_per_second)
+
+    def requests_per_hour(values: dict[str, float]) -> float:
+        return get_requests_per_hour(values[SLAP], values[ENERGY], values[CHARGE], max_slaps_per_request)
+
+    current_score = score_per_hour(stats)
+    current_requests = requests_per_hour(stats)
+    request_value = request_weight * current_score / current_requests if current_requests else 0
+
+    def get_gain(values: dict[str, float]) -> float:
+        requests_saved = current_requests - requests_per_hour(values)
+
+        return score_per_hour(values) - current_score + requests_saved * request_value
+
+    options = {boost_type: boost for boost_type, boost in upgradable_boosts.items()
+               if boost_type in max_levels and boost.level <= max_levels[boost_type]}
+
+    best_option = None
+
+    for boost_type, boost in options.items():
+        upgraded_stats = get_upgraded_stats(stats=stats, boost_type=boost_type, level=boost.level)
+        gain = get_gain(upgraded_stats)
+        payback = boost.price / gain if gain > 0 else float('inf')
+
+        for next_type, next_boost in options.items():
+            if next_type == boost_type:
+                continue
+
+            next_stats = get_upgraded_stats(stats=upgraded_stats, boost_type=next_type, level=next_boost.level)
+            next_gain = get_gain(next_stats)
+
+            if next_gain > 0 and (boost.price + next_boost.price) / next_gain < payback:
+                gain = next_gain
+                payback = (boost.price + next_boost.price) / next_gain
+
+        if payback > max_payback:
+            continue
+
+        option = {
+            'type': boost_type,
+            'level': boost.level,
+            'price': boost.price,
+            'gain': gain,
+            'payback': payback,
+            'requests_saved': current_requests - requests_per_hour(upgraded_stats),
+        }
+
+        if best_option is None or payback < best_option['payback']:
+            best_option = option
+
+    return best_option
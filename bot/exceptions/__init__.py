@@ -1,2 +1,8 @@
 class InvalidSession(BaseException):
     ...
+
+
+class RequestError(Exception):
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,111 @@
+import sqlite3
+from time import time
+
+from bot.config import settings
+
+
+class AuthCache:
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(database=self.path, timeout=30, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS auth (
+                    session_name TEXT PRIMARY KEY,
+                    tg_web_data TEXT,
+                    tg_web_data_expires_at REAL NOT NULL DEFAULT 0,
+                    access_token TEXT,
+                    access_token_expires_at REAL NOT NULL DEFAULT 0,
+                    peer_id INTEGER,
+                    peer_access_hash INTEGER
+                )
+            """)
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS validation (
+                    session_name TEXT PRIMARY KEY,
+                    valid INTEGER NOT NULL,
+                    reason TEXT,
+                    checked_at REAL NOT NULL
+                )
+            """)
+
+        return self._connection
+
+    def _get(self, session_name: str, *columns: str) -> tuple | None:
+        if not settings.USE_AUTH_CACHE:
+            return None
+
+        return self.connection.execute(
+            f"SELECT {', '.join(columns)} FROM auth WHERE session_name = ?", (session_name,)).fetchone()
+
+    def _set(self, session_name: str, **values) -> None:
+        if not settings.USE_AUTH_CACHE:
+            return
+
+        columns = ', '.join(values)
+        placeholders = ', '.join('?' for _ in values)
+        updates = ', '.join(f'{column} = excluded.{column}' for column in values)
+
+        self.connection.execute(
+            f"INSERT INTO auth (session_name, {columns}) VALUES (?, {placeholders}) "
+            f"ON CONFLICT(session_name) DO UPDATE SET {updates}",
+            (session_name, *values.values()))
+
+    def get_access_token(self, session_name: str, margin: int = 60) -> tuple[str | None, float]:
+        row = self._get(session_name, 'access_token', 'access_token_expires_at')
+
+        if not row or not row[0] or row[1] - margin <= time():
+            return None, 0
+
+        return row[0], row[1]
+
+    def set_access_token(self, session_name: str, access_token: str, expires_at: float) -> None:
+        self._set(session_name, access_token=access_token, access_token_expires_at=expires_at)
+
+    def get_tg_web_data(self, session_name: str) -> str | None:
+        row = self._get(session_name, 'tg_web_data', 'tg_web_data_expires_at')
+
+        if not row or not row[0] or row[1] <= time():
+            return None
+
+        return row[0]
+
+    def set_tg_web_data(self, session_name: str, tg_web_data: str, expires_at: float) -> None:
+        self._set(session_name, tg_web_data=tg_web_data, tg_web_data_expires_at=expires_at)
+
+    def get_peer(self, session_name: str) -> tuple[int, int] | None:
+        row = self._get(session_name, 'peer_id', 'peer_access_hash')
+
+        if not row or row[0] is None:
+            return None
+
+        return row[0], row[1]
+
+    def set_peer(self, session_name: str, peer_id: int, access_hash: int) -> None:
+        self._set(session_name, peer_id=peer_id, peer_access_hash=access_hash)
+
+    def invalidate(self, session_name: str) -> None:
+        self._set(session_name, tg_web_data=None, tg_web_data_expires_at=0,
+                  access_token=None, access_token_expires_at=0)
+
+    def set_validation(self, session_name: str, valid: bool, reason: str | None = None) -> None:
+        if not settings.USE_AUTH_CACHE:
+            return
+
+        self.connection.execute(
+            "INSERT OR REPLACE INTO validation (session_name, valid, reason, checked_at) VALUES (?, ?, ?, ?)",
+            (session_name, valid, reason, time()))
+
+    def get_invalid_sessions(self) -> set[str]:
+        if not settings.USE_AUTH_CACHE:
+            return set()
+
+        return {row[0] for row in self.connection.execute("SELECT session_name FROM validation WHERE valid = 0")}
+
+
+auth_cache = AuthCache(path='sessions/auth_cache.db')
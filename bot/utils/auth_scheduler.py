@@ -0,0 +1,74 @@
+import asyncio
+from time import time
+from random import uniform
+from typing import Awaitable, Callable
+
+from pyrogram.errors import FloodWait
+
+from bot.config import settings
+from bot.utils import logger
+from bot.exceptions import RequestError
+
+
+class AuthScheduler:
+    def __init__(self, sessions_count: int, ramp_window: int | None = None):
+        self.sessions_count = sessions_count
+        self.ramp_window = ramp_window
+        self.semaphore = asyncio.Semaphore(value=settings.AUTH_MAX_CONCURRENT)
+
+        self.started_at = time()
+        self.ramped_sessions: set[str] = set()
+        self.active_sessions: set[str] = set()
+        self.failed_sessions: set[str] = set()
+
+        self.requests_count = 0
+        self.flood_waits_count = 0
+        self.reported = False
+
+    async def authorize(self, session_name: str, get_tg_web_data: Callable[[], Awaitable[str]],
+                        wait: bool = True) -> str:
+        ramp_window = settings.AUTH_RAMP_WINDOW if self.ramp_window is None else self.ramp_window
+
+        if ramp_window and session_name not in self.ramped_sessions:
+            self.ramped_sessions.add(session_name)
+
+            delay = uniform(0, ramp_window)
+            logger.info(f"{session_name} | Authorization in {delay:.1f}s")
+            await asyncio.sleep(delay=delay)
+
+        while True:
+            async with self.semaphore:
+                self.requests_count += 1
+
+                try:
+                    return await get_tg_web_data()
+                except FloodWait as error:
+                    self.flood_waits_count += 1
+                    delay = error.value
+
+            if not wait:
+                logger.warning(f"{session_name} | FloodWait {delay}s, authorization rescheduled")
+                raise RequestError(f"Authorization postponed by FloodWait {delay}s",
+                                   retry_after=delay + uniform(1, 5))
+
+            logger.warning(f"{session_name} | FloodWait {delay}s, authorization re-queued")
+            await asyncio.sleep(delay=delay + uniform(1, 5))
+
+    def mark_active(self, session_name: str) -> None:
+        self.active_sessions.add(session_name)
+        self.report()
+
+    def mark_failed(self, session_name: str) -> None:
+        self.failed_sessions.add(session_name)
+        self.report()
+
+    def report(self) -> None:
+        if self.reported or len(self.active_sessions | self.failed_sessions) < self.sessions_count:
+            return
+
+        self.reported = True
+
+        flood_wait_rate = self.flood_waits_count / self.requests_count if self.requests_count else 0
+        logger.info(f"All sessions started in <c>{time() - self.started_at:.1f}s</c> | "
+                    f"Active: <g>{len(self.active_sessions)}</g>/{self.sessions_count} | "
+                    f"FloodWait: <r>{self.flood_waits_count}</r>/{self.requests_count} ({flood_wait_rate:.1%})")
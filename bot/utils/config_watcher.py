@@ -0,0 +1,88 @@
+import os
+import asyncio
+from typing import Awaitable, Callable
+
+from pydantic import ValidationError
+
+from bot.config import settings
+from bot.config.config import Settings
+from bot.utils import logger
+
+
+RESTART_REQUIRED = {'API_ID', 'API_HASH', 'ENGINE', 'ENGINE_WORKERS', 'AUTH_MAX_CONCURRENT', 'RETRY_ATTEMPTS',
+                    'RETRY_BASE_DELAY', 'RETRY_MAX_DELAY', 'HTTP_POOL_LIMIT', 'HTTP_DNS_CACHE_TTL',
+                    'HTTP_KEEPALIVE_TIMEOUT', 'LOG_FORMAT', 'LOG_MODE', 'LOG_SAMPLE_RATE', 'LOG_ENQUEUE', 'METRICS_HOST',
+                    'METRICS_PORT', 'METRICS_FILE', 'USE_UVLOOP', 'USE_SESSION_STORE', 'USE_STATS_STORE',
+                    'RATE_LIMIT_INITIAL'}
+
+
+def get_mtime(path: str) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+async def reload_settings() -> None:
+    try:
+        new_settings = Settings()
+    except ValidationError as error:
+        logger.warning(f"Settings were not reloaded, .env is invalid: {error}")
+        return
+
+    changes = {name: value for name, value in new_settings if value != getattr(settings, name)}
+    ignored = sorted(changes.keys() & RESTART_REQUIRED)
+
+    for name in ignored:
+        changes.pop(name)
+
+    for name, value in changes.items():
+        setattr(settings, name, value)
+
+    if changes:
+        logger.info(f"Settings reloaded | {', '.join(f'{name}={value}' for name, value in changes.items())}")
+
+    if ignored:
+        logger.warning(f"Changes of {', '.join(ignored)} are applied only after a restart")
+
+
+class ConfigWatcher:
+    def __init__(self):
+        self.callbacks: dict[str, list[Callable[[], Awaitable[None]]]] = {}
+        self.mtimes: dict[str, float | None] = {}
+        self.task: asyncio.Task | None = None
+
+        self.watch(path='.env', callback=reload_settings)
+
+    def watch(self, path: str, callback: Callable[[], Awaitable[None]]) -> None:
+        self.callbacks.setdefault(path, []).append(callback)
+        self.mtimes.setdefault(path, get_mtime(path=path))
+
+    async def poll(self) -> None:
+        for path, callbacks in self.callbacks.items():
+            mtime = get_mtime(path=path)
+
+            if mtime == self.mtimes[path]:
+                continue
+
+            self.mtimes[path] = mtime
+
+            for callback in callbacks:
+                try:
+                    await callback()
+                except Exception as error:
+                    logger.error(f"Failed to apply changes of {path}: {error}")
+
+    async def run(self) -> None:
+        while settings.CONFIG_RELOAD_INTERVAL > 0:
+            await asyncio.sleep(delay=settings.CONFIG_RELOAD_INTERVAL)
+            await self.poll()
+
+    def start(self) -> None:
+        if settings.CONFIG_RELOAD_INTERVAL > 0 and self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
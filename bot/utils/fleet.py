@@ -0,0 +1,65 @@
+import asyncio
+from time import time
+
+from bot.config import settings
+from bot.utils import logger
+
+
+class FleetStatus:
+    def __init__(self):
+        self.started_at = time()
+
+        self.active_sessions: set[str] = set()
+        self.failed_sessions: set[str] = set()
+
+        self.slaps = 0
+        self.earned = 0
+        self.errors = 0
+
+    def mark_active(self, session_name: str) -> None:
+        self.active_sessions.add(session_name)
+
+    def mark_failed(self, session_name: str) -> None:
+        self.active_sessions.discard(session_name)
+        self.failed_sessions.add(session_name)
+
+    def record_slap(self, earned: int) -> None:
+        self.slaps += 1
+        self.earned += earned
+
+    def record_error(self) -> None:
+        self.errors += 1
+
+    async def report(self) -> None:
+        reported_at = time()
+        previous_earned = self.earned
+        previous_errors = self.errors
+
+        while True:
+            await asyncio.sleep(delay=settings.LOG_SUMMARY_INTERVAL)
+
+            elapsed_minutes = (time() - reported_at) / 60
+
+            logger.info(f"Fleet | Active: <g>{len(self.active_sessions):>6}</g> | "
+                        f"Failed: <r>{len(self.failed_sessions):>5}</r> | "
+                        f"Slaps: {self.slaps:>9} | "
+                        f"Score/min: <g>{(self.earned - previous_earned) / elapsed_minutes:>10.0f}</g> | "
+                        f"Earned: <g>+{self.earned}</g> | "
+                        f"Errors/min: <r>{(self.errors - previous_errors) / elapsed_minutes:>6.1f}</r>")
+
+            reported_at = time()
+            previous_earned = self.earned
+            previous_errors = self.errors
+
+    def snapshot(self) -> dict[str, int | float]:
+        return dict(
+            started_at=self.started_at,
+            active=len(self.active_sessions),
+            failed=len(self.failed_sessions),
+            slaps=self.slaps,
+            earned=self.earned,
+            errors=self.errors
+        )
+
+
+fleet_status = FleetStatus()
@@ -1,18 +1,38 @@
 import os
 import glob
+import signal
 import asyncio
 import argparse
+import multiprocessing
+from time import time
 from itertools import cycle
+from typing import Awaitable, Callable, Iterable
+from contextlib import suppress
 
-from pyrogram import Client
 from better_proxy import Proxy
 
 from bot.config import settings
 from bot.utils import logger
+from bot.utils.auth_cache import auth_cache
+from bot.utils.auth_scheduler import AuthScheduler
+from bot.utils.config_watcher import ConfigWatcher
+from bot.utils.loop_monitor import loop_monitor
+from bot.utils.fleet import fleet_status
+from bot.utils.metrics import metrics
+from bot.utils.proxy_pool import proxy_pool
+from bot.utils.rate_limiter import rate_limiters
+from bot.utils.session_store import session_store
+from bot.utils.stats_store import stats_store
 from bot.core.slapper import run_slapper
-from bot.core.registrator import register_sessions
+from bot.core.http_pool import http_pool
+from bot.core.engine import Engine
+from bot.core.registrator import register_sessions, import_sessions
+from bot.core.tg_client import LazyClient
 
 
+WORKER_MIN_UPTIME = 60
+WORKER_MAX_RESTARTS = 5
+
 start_text = """
 
 ▒█  ▒█ █▀▀█ █▀▀█ █▀▄▀█ ▒█▀▀▀█ █   █▀▀█ █▀▀█ ▒█▀▀█ █▀▀█ ▀▀█▀▀ 
@@ -23,14 +43,18 @@ Select an action:
 
     1. Create session
     2. Run clicker
+    3. Show stats
 """
 
 
 def get_session_names() -> list[str]:
     session_names = glob.glob('sessions/*.session')
-    session_names = [os.path.splitext(os.path.basename(file))[0] for file in session_names]
+    session_names = {os.path.splitext(os.path.basename(file))[0] for file in session_names}
+
+    if settings.USE_SESSION_STORE:
+        session_names.update(session_store.get_session_names())
 
-    return session_names
+    return sorted(session_names - auth_cache.get_invalid_sessions())
 
 
 def get_proxies() -> list[Proxy]:
@@ -43,8 +67,34 @@ def get_proxies() -> list[Proxy]:
     return proxies
 
 
-async def get_tg_clients() -> list[Client]:
-    session_names = get_session_names()
+def get_proxy_assignments(session_names: list[str], proxies: list[str]) -> dict[str, str | None]:
+    proxies_cycle = cycle(proxies) if proxies else None
+
+    return {session_name: next(proxies_cycle) if proxies_cycle else None for session_name in session_names}
+
+
+def get_shards(proxy_assignments: dict[str, str | None], shards_count: int) -> list[dict[str, str | None]]:
+    groups: dict[str | None, list[str]] = {}
+
+    for session_name, proxy in proxy_assignments.items():
+        groups.setdefault(proxy, []).append(session_name)
+
+    shards = [{} for _ in range(shards_count)]
+
+    for proxy, session_names in sorted(groups.items(), key=lambda item: len(item[1]), reverse=True):
+        if proxy is None:
+            continue
+
+        min(shards, key=len).update(dict.fromkeys(session_names, proxy))
+
+    for session_name in groups.get(None, []):
+        min(shards, key=len)[session_name] = None
+
+    return [shard for shard in shards if shard]
+
+
+async def get_tg_clients(session_names: list[str] | None = None) -> list[LazyClient]:
+    session_names = get_session_names() if session_names is None else session_names
 
     if not session_names:
         raise FileNotFoundError("Not found session files")
@@ -52,13 +102,14 @@ async def get_tg_clients() -> list[Client]:
     if not settings.API_ID or not settings.API_HASH:
         raise ValueError("API_ID and API_HASH not found in the .env file.")
 
-    tg_clients = [Client(
-        name=session_name,
-        api_id=settings.API_ID,
-        api_hash=settings.API_HASH,
-        workdir='sessions/',
-        plugins=dict(root='bot/plugins')
-    ) for session_name in session_names]
+    session_strings = {}
+
+    if settings.USE_SESSION_STORE:
+        await session_store.sync(session_names=session_names)
+        session_strings = session_store.load()
+
+    tg_clients = [LazyClient(name=session_name, session_string=session_strings.get(session_name))
+                  for session_name in session_names]
 
     return tg_clients
 
@@ -66,10 +117,17 @@ async def get_tg_clients() -> list[Client]:
 async def process() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument('-a', '--action', type=int, help='Action to perform')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='Number of worker processes for the clicker')
+    parser.add_argument('--import', dest='import_path',
+                        help='Validate and import a folder of .session files or a file of session strings')
+    parser.add_argument('--windows', type=int, nargs='+', help='Stats report windows in hours')
+    parser.add_argument('--profile', type=int, nargs='?', const=settings.PROFILE_DURATION,
+                        help='Profile the clicker for the given number of seconds after start')
 
     logger.info(f"Detected {len(get_session_names())} sessions | {len(get_proxies())} proxies")
 
-    action = parser.parse_args().action
+    args = parser.parse_args()
+    action = args.action
 
     if not action:
         print(start_text)
@@ -79,24 +137,300 @@ async def process() -> None:
 
             if not action.isdigit():
                 logger.warning("Action must be number")
-            elif action not in ['1', '2']:
-                logger.warning("Action must be 1 or 2")
+            elif action not in ['1', '2', '3']:
+                logger.warning("Action must be 1, 2 or 3")
             else:
                 action = int(action)
                 break
 
     if action == 1:
-        await register_sessions()
+        if args.import_path:
+            await import_sessions(path=args.import_path, proxies=get_proxies())
+        else:
+            await register_sessions()
     elif action == 2:
-        tg_clients = await get_tg_clients()
+        if args.workers > 1:
+            await run_workers(workers_count=args.workers, profile_duration=args.profile)
+        else:
+            tg_clients = await get_tg_clients()
+            await metrics.start()
 
-        await run_tasks(tg_clients=tg_clients)
+            if settings.LOG_MODE == 'summary':
+                asyncio.create_task(fleet_status.report())
 
+            await run_tasks(tg_clients=tg_clients, watch_sessions=True, profile_duration=args.profile)
+    elif action == 3:
+        stats_store.report(windows=args.windows or settings.STATS_REPORT_WINDOWS)
 
-async def run_tasks(tg_clients: list[Client]):
-    proxies = get_proxies()
-    proxies_cycle = cycle(proxies) if proxies else None
-    tasks = [asyncio.create_task(run_slapper(tg_client=tg_client, proxy=next(proxies_cycle) if proxies_cycle else None))
+
+async def run_tasks(tg_clients: list[LazyClient], proxy_assignments: dict[str, str | None] | None = None,
+                    watch_sessions: bool = False, profile_duration: int | None = None):
+    if proxy_assignments is None:
+        proxies = get_proxies()
+        proxy_assignments = get_proxy_assignments(session_names=[tg_client.name for tg_client in tg_clients],
+                                                  proxies=proxies)
+        shard_proxies = None
+    else:
+        proxies = shard_proxies = [proxy for proxy in dict.fromkeys(proxy_assignments.values()) if proxy]
+
+    await proxy_pool.start(proxies=proxies)
+    stats_store.start()
+    loop_monitor.start(profile_duration=profile_duration)
+
+    config_watcher = ConfigWatcher()
+    watch_proxies(config_watcher=config_watcher, proxies=shard_proxies)
+
+    if settings.ENGINE == 'scheduler':
+        engine = Engine(auth_scheduler=AuthScheduler(sessions_count=len(tg_clients), ramp_window=0))
+
+        for tg_client in tg_clients:
+            engine.add(tg_client=tg_client, proxy=proxy_assignments[tg_client.name])
+
+        async def add_sessions(session_names: list[str]) -> None:
+            for tg_client in await get_tg_clients(session_names=session_names):
+                engine.add(tg_client=tg_client, proxy=None)
+
+        if watch_sessions:
+            watch_session_files(config_watcher=config_watcher, session_names=proxy_assignments,
+                                on_new_sessions=add_sessions)
+
+        config_watcher.start()
+
+        try:
+            await engine.run()
+        finally:
+            config_watcher.stop()
+            loop_monitor.stop()
+            proxy_pool.stop()
+            await stats_store.stop()
+            await http_pool.close()
+
+        return
+
+    auth_scheduler = AuthScheduler(sessions_count=len(tg_clients))
+    tasks = [asyncio.create_task(run_slapper(tg_client=tg_client, proxy=proxy_assignments[tg_client.name],
+                                             auth_scheduler=auth_scheduler))
              for tg_client in tg_clients]
 
-    await asyncio.gather(*tasks)
+    async def add_sessions(session_names: list[str]) -> None:
+        for tg_client in await get_tg_clients(session_names=session_names):
+            tasks.append(asyncio.create_task(run_slapper(tg_client=tg_client, proxy=None,
+                                                         auth_scheduler=auth_scheduler)))
+
+    if watch_sessions:
+        watch_session_files(config_watcher=config_watcher, session_names=proxy_assignments,
+                            on_new_sessions=add_sessions)
+
+    config_watcher.start()
+
+    try:
+        while pending := [task for task in tasks if not task.done()]:
+            await asyncio.gather(*pending)
+    finally:
+        config_watcher.stop()
+        loop_monitor.stop()
+        proxy_pool.stop()
+        await stats_store.stop()
+        await http_pool.close()
+
+
+def watch_proxies(config_watcher: ConfigWatcher, proxies: list[str] | None = None) -> None:
+    allowed_proxies = None if proxies is None else set(proxies)
+    current_proxies = set(get_proxies())
+
+    async def reload_proxies() -> None:
+        nonlocal current_proxies
+
+        proxies = get_proxies()
+        added = [proxy for proxy in proxies
+                 if proxy not in current_proxies and (allowed_proxies is None or proxy in allowed_proxies)]
+        removed = list(current_proxies.difference(proxies))
+        current_proxies = set(proxies)
+
+        if added or removed:
+            await proxy_pool.reload(added=added, removed=removed)
+
+    config_watcher.watch(path='bot/config/proxies.txt', callback=reload_proxies)
+    config_watcher.watch(path='.env', callback=reload_proxies)
+
+
+def watch_session_files(config_watcher: ConfigWatcher, session_names: Iterable[str],
+                        on_new_sessions: Callable[[list[str]], Awaitable[None]]) -> None:
+    known_session_names = set(session_names)
+
+    async def reload_sessions() -> None:
+        new_session_names = [session_name for session_name in get_session_names()
+                             if session_name not in known_session_names]
+
+        if not new_session_names:
+            return
+
+        known_session_names.update(new_session_names)
+        logger.info(f"Detected {len(new_session_names)} new sessions")
+
+        await on_new_sessions(new_session_names)
+
+    config_watcher.watch(path='sessions', callback=reload_sessions)
+
+
+async def report_worker_status(worker_index: int, status_queue: multiprocessing.Queue) -> None:
+    while True:
+        status_queue.put((worker_index, fleet_status.snapshot()))
+        await asyncio.sleep(delay=settings.WORKERS_STATUS_INTERVAL)
+
+
+async def run_worker_tasks(worker_index: int, proxy_assignments: dict[str, str | None],
+                           status_queue: multiprocessing.Queue, profile_duration: int | None = None,
+                           rate_share: float = 1) -> None:
+    rate_limiters.share = rate_share
+    tg_clients = await get_tg_clients(session_names=list(proxy_assignments))
+    await metrics.start(worker_index=worker_index)
+    status_task = asyncio.create_task(report_worker_status(worker_index=worker_index, status_queue=status_queue))
+
+    try:
+        await run_tasks(tg_clients=tg_clients, proxy_assignments=proxy_assignments, profile_duration=profile_duration)
+    finally:
+        status_task.cancel()
+        status_queue.put((worker_index, fleet_status.snapshot()))
+
+
+def run_worker(worker_index: int, proxy_assignments: dict[str, str | None],
+               status_queue: multiprocessing.Queue, profile_duration: int | None = None,
+               rate_share: float = 1) -> None:
+    if settings.USE_UVLOOP:
+        try:
+            import uvloop
+
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            logger.warning(f"Worker {worker_index} | uvloop is not installed, using default event loop")
+
+    with suppress(KeyboardInterrupt):
+        asyncio.run(run_worker_tasks(worker_index=worker_index, proxy_assignments=proxy_assignments,
+                                     status_queue=status_queue, profile_duration=profile_duration,
+                                     rate_share=rate_share))
+
+
+async def run_workers(workers_count: int, profile_duration: int | None = None) -> None:
+    session_names = get_session_names()
+
+    if not session_names:
+        raise FileNotFoundError("Not found session files")
+
+    if settings.USE_SESSION_STORE:
+        await session_store.sync(session_names=session_names)
+
+    proxy_assignments = get_proxy_assignments(session_names=session_names, proxies=get_proxies())
+    shards = get_shards(proxy_assignments=proxy_assignments, shards_count=workers_count)
+    direct_shards = sum(None in shard.values() for shard in shards)
+
+    context = multiprocessing.get_context('spawn')
+    status_queue = context.Queue()
+    statuses: dict[int, dict[str, int | float]] = {}
+    retired_statuses: list[dict[str, int | float]] = []
+    started_at: dict[int, float] = {}
+    restart_at: dict[int, float] = {}
+    restarts: dict[int, int] = {}
+
+    def start_worker(worker_index: int) -> multiprocessing.Process:
+        worker = context.Process(target=run_worker,
+                                 args=(worker_index, shards[worker_index], status_queue, profile_duration,
+                                       1 / max(direct_shards, 1) if None in shards[worker_index].values() else 1),
+                                 name=f'worker-{worker_index}', daemon=True)
+        worker.start()
+        started_at[worker_index] = time()
+
+        return worker
+
+    workers = {index: start_worker(worker_index=index) for index in range(len(shards))}
+    logger.info(f"Started {len(workers)} workers for {len(session_names)} sessions")
+
+    async def add_sessions(new_session_names: list[str]) -> None:
+        if settings.USE_SESSION_STORE:
+            await session_store.sync(session_names=new_session_names)
+
+        owned_proxies = {proxy for worker_index in workers for proxy in shards[worker_index].values()}
+        free_proxies = [proxy for proxy in get_proxies() if proxy not in owned_proxies]
+
+        if not free_proxies:
+            logger.warning(f"No free proxies for {len(new_session_names)} new sessions, "
+                           f"restart to rebuild the worker shards")
+            return
+
+        shards.append(get_proxy_assignments(session_names=new_session_names, proxies=free_proxies))
+        workers[len(shards) - 1] = start_worker(worker_index=len(shards) - 1)
+
+        logger.info(f"Started worker {len(shards) - 1} for {len(new_session_names)} new sessions")
+
+    config_watcher = ConfigWatcher()
+    watch_session_files(config_watcher=config_watcher, session_names=session_names, on_new_sessions=add_sessions)
+    config_watcher.start()
+
+    def toggle_profile() -> None:
+        for worker in workers.values():
+            os.kill(worker.pid, signal.SIGUSR1)
+
+    if hasattr(signal, 'SIGUSR1'):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, toggle_profile)
+
+    reported_at = time()
+    previous_earned = 0
+
+    while workers:
+        await asyncio.sleep(delay=1)
+
+        while not status_queue.empty():
+            worker_index, status = status_queue.get_nowait()
+            statuses[worker_index] = status
+
+        for worker_index, worker in list(workers.items()):
+            if worker.is_alive():
+                continue
+
+            if worker.exitcode == 0:
+                logger.info(f"Worker {worker_index} finished")
+                workers.pop(worker_index)
+                continue
+
+            if worker_index in restart_at:
+                if time() >= restart_at[worker_index]:
+                    restart_at.pop(worker_index)
+                    workers[worker_index] = start_worker(worker_index=worker_index)
+
+                continue
+
+            if worker_index in statuses:
+                retired_statuses.append(statuses.pop(worker_index))
+
+            if time() - started_at[worker_index] < WORKER_MIN_UPTIME:
+                restarts[worker_index] = restarts.get(worker_index, 0) + 1
+            else:
+                restarts[worker_index] = 1
+
+            if restarts[worker_index] > WORKER_MAX_RESTARTS:
+                logger.error(f"Worker {worker_index} died with code {worker.exitcode} "
+                             f"{WORKER_MAX_RESTARTS} times in a row right after start, giving up")
+                workers.pop(worker_index)
+                continue
+
+            restart_delay = min(settings.RESTART_DELAY * 2 ** (restarts[worker_index] - 1), 600)
+            restart_at[worker_index] = time() + restart_delay
+
+            logger.error(f"Worker {worker_index} died with code {worker.exitcode}, restart in {restart_delay}s")
+
+        if time() - reported_at >= settings.WORKERS_STATUS_INTERVAL:
+            all_statuses = [*statuses.values(), *retired_statuses]
+            earned = sum(status['earned'] for status in all_statuses)
+            earned_per_minute = (earned - previous_earned) / (time() - reported_at) * 60
+
+            logger.info(f"Workers: <c>{len(workers)}</c>/{len(shards)} | "
+                        f"Active: <g>{sum(status['active'] for status in statuses.values())}</g> | "
+                        f"Failed: <r>{sum(status['failed'] for status in statuses.values())}</r> | "
+                        f"Slaps: {sum(status['slaps'] for status in all_statuses)} | "
+                        f"Earned: <g>+{earned}</g> (<g>+{earned_per_minute:.0f}</g>/min) | "
+                        f"Errors: <r>{sum(status['errors'] for status in all_statuses)}</r>")
+
+            reported_at = time()
+            previous_earned = earned
+
+    config_watcher.stop()
@@ -1,10 +1,63 @@
 import sys
+import json
+from zlib import crc32
+
 from loguru import logger
 
+from bot.config import settings
+
+
+TEXT_FORMAT = ("<white>{time:YYYY-MM-DD HH:mm:ss}</white>"
+               " | <level>{level: <8}</level>"
+               " | <cyan><b>{line}</b></cyan>"
+               " - <white><b>{message}</b></white>")
+
+
+def format_json(record: dict) -> str:
+    record["extra"]["json"] = json.dumps({
+        'time': record["time"].isoformat(),
+        'level': record["level"].name,
+        'line': record["line"],
+        'session': record["extra"].get("session_name"),
+        'message': record["message"],
+    }, ensure_ascii=False)
+
+    return "{extra[json]}\n"
+
+
+class QuietLogger:
+    """Drops routine per-account lines and forwards warnings and errors."""
+
+    def __init__(self, logger_):
+        self._logger = logger_
+
+    def __getattr__(self, name: str):
+        return getattr(self._logger, name)
+
+    def debug(self, *args, **kwargs) -> None:
+        pass
+
+    def info(self, *args, **kwargs) -> None:
+        pass
+
+    def success(self, *args, **kwargs) -> None:
+        pass
+
+
+def is_sampled(session_name: str) -> bool:
+    return crc32(session_name.encode()) % 10000 < settings.LOG_SAMPLE_RATE * 10000
+
+
+def get_session_logger(session_name: str):
+    session_logger = logger.bind(session_name=session_name)
+
+    if settings.LOG_MODE == 'summary' and not is_sampled(session_name=session_name):
+        return QuietLogger(session_logger)
+
+    return session_logger
+
 
 logger.remove()
-logger.add(sink=sys.stdout, format="<white>{time:YYYY-MM-DD HH:mm:ss}</white>"
-                                   " | <level>{level: <8}</level>"
-                                   " | <cyan><b>{line}</b></cyan>"
-                                   " - <white><b>{message}</b></white>")
+logger.add(sink=sys.stdout, format=format_json if settings.LOG_FORMAT == 'json' else TEXT_FORMAT,
+           colorize=False if settings.LOG_FORMAT == 'json' else None, enqueue=settings.LOG_ENQUEUE)
 logger = logger.opt(colors=True)
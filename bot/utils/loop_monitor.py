@@ -0,0 +1,229 @@
+import os
+import pstats
+import signal
+import asyncio
+import cProfile
+from time import perf_counter, strftime
+from asyncio import events
+from collections import Counter, deque
+
+from bot.config import settings
+from bot.utils import logger
+from bot.utils.metrics import metrics
+
+
+TASK_SAMPLE_INTERVAL = 5
+
+
+def get_coroutine_stack(coroutine) -> list[str]:
+    stack = []
+
+    while coroutine is not None and hasattr(coroutine, 'cr_frame'):
+        stack.append(coroutine.__qualname__)
+        coroutine = coroutine.cr_await
+
+    return stack
+
+
+def get_task_method(task: asyncio.Task) -> str:
+    stack = get_coroutine_stack(coroutine=task.get_coro())
+
+    for name in reversed(stack):
+        if name.startswith('Slapper.'):
+            return name
+
+    return stack[0] if stack else repr(task.get_coro())
+
+
+def get_callback_name(callback) -> str:
+    owner = getattr(callback, '__self__', None)
+
+    if isinstance(owner, asyncio.Task):
+        return get_task_method(task=owner)
+
+    return getattr(callback, '__qualname__', repr(callback))
+
+
+def percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0
+
+    values = sorted(values)
+
+    return values[min(int(len(values) * percent / 100), len(values) - 1)]
+
+
+class LoopMonitor:
+    def __init__(self):
+        self.lags: deque[float] = deque(maxlen=1000)
+        self.slow_callbacks: Counter[str] = Counter()
+        self.slowest_callbacks: dict[str, float] = {}
+        self.task_samples: Counter[str] = Counter()
+        self.tasks: list[asyncio.Task] = []
+
+        self.profiler: cProfile.Profile | None = None
+        self.profile_samples: Counter[str] = Counter()
+        self.profile_handle: asyncio.TimerHandle | None = None
+
+    def install_slow_callback_hook(self) -> None:
+        if getattr(events.Handle._run, 'loop_monitor', False):
+            return
+
+        run = events.Handle._run
+        monitor = self
+
+        def run_handle(handle: events.Handle) -> None:
+            callback = handle._callback
+            started_at = perf_counter()
+            run(handle)
+            duration = perf_counter() - started_at
+
+            if 0 < settings.SLOW_CALLBACK_DURATION <= duration:
+                monitor.record_slow_callback(name=get_callback_name(callback=callback), duration=duration)
+
+        run_handle.loop_monitor = True
+        events.Handle._run = run_handle
+
+    def record_slow_callback(self, name: str, duration: float) -> None:
+        self.slow_callbacks[name] += 1
+        self.slowest_callbacks[name] = max(self.slowest_callbacks.get(name, 0), duration)
+        metrics.record_slow_callback(callback=name)
+
+    def sample_tasks(self) -> Counter[str]:
+        methods = Counter(get_task_method(task=task) for task in asyncio.all_tasks() if not task.done())
+
+        self.task_samples.update(methods)
+
+        if self.profiler is not None:
+            self.profile_samples.update(methods)
+
+        metrics.clear_gauge('wormslap_tasks')
+        for method, count in methods.items():
+            metrics.set_gauge('wormslap_tasks', count, method=method)
+
+        return methods
+
+    async def sample_lag(self) -> None:
+        sampled_at = perf_counter()
+
+        while True:
+            interval = settings.LOOP_LAG_INTERVAL
+            started_at = perf_counter()
+            await asyncio.sleep(delay=interval)
+            lag = max(perf_counter() - started_at - interval, 0)
+
+            self.lags.append(lag)
+            metrics.set_gauge('wormslap_loop_lag_seconds', lag)
+
+            if perf_counter() - sampled_at >= TASK_SAMPLE_INTERVAL:
+                sampled_at = perf_counter()
+                self.sample_tasks()
+
+    def log_report(self) -> None:
+        lags = list(self.lags)
+        methods = self.sample_tasks()
+
+        logger.info(f"Loop | Lag: p50 <c>{percentile(lags, 50) * 1000:.1f}</c>ms | "
+                    f"p99 <c>{percentile(lags, 99) * 1000:.1f}</c>ms | "
+                    f"max <r>{max(lags, default=0) * 1000:.1f}</r>ms | "
+                    f"Tasks: {sum(methods.values())} | Slow callbacks: <r>{sum(self.slow_callbacks.values())}</r>")
+
+        total_samples = sum(self.task_samples.values())
+
+        if total_samples:
+            breakdown = ', '.join(f"{method} {count / total_samples:.0%}"
+                                  for method, count in self.task_samples.most_common(8))
+            logger.info(f"Loop | Tasks by method: {breakdown}")
+
+        if self.slow_callbacks:
+            slowest = sorted(self.slowest_callbacks.items(), key=lambda item: item[1], reverse=True)[:5]
+            breakdown = ', '.join(f"{name} {duration * 1000:.0f}ms (x{self.slow_callbacks[name]})"
+                                  for name, duration in slowest)
+            logger.warning(f"Loop | Slowest callbacks: {breakdown}")
+
+        self.lags.clear()
+        self.slow_callbacks.clear()
+        self.slowest_callbacks.clear()
+        self.task_samples.clear()
+
+    async def report(self) -> None:
+        while True:
+            await asyncio.sleep(delay=settings.LOOP_REPORT_INTERVAL)
+            self.log_report()
+
+    def start_profile(self, duration: float) -> None:
+        if self.profiler is not None:
+            logger.warning("Profiler is already running")
+            return
+
+        self.profile_samples.clear()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        self.profile_handle = asyncio.get_running_loop().call_later(duration, self.stop_profile)
+
+        logger.info(f"Profiler started for {duration:.0f}s")
+
+    def stop_profile(self) -> None:
+        if self.profiler is None:
+            return
+
+        self.profiler.disable()
+        self.profile_handle.cancel()
+
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        path = os.path.join(settings.PROFILE_DIR, f'profile-{strftime("%Y%m%d-%H%M%S")}-{os.getpid()}')
+
+        self.profiler.dump_stats(f'{path}.prof')
+
+        with open(file=f'{path}.txt', mode='w', encoding='utf-8') as file:
+            total_samples = sum(self.profile_samples.values())
+
+            file.write("Tasks by method (wall-clock samples)\n")
+            for method, count in self.profile_samples.most_common():
+                file.write(f"{count / total_samples:8.1%}  {method}\n")
+
+            file.write("\n")
+            pstats.Stats(self.profiler, stream=file).sort_stats('cumulative').print_stats(50)
+
+        self.profiler = None
+        self.profile_handle = None
+
+        logger.info(f"Profile written to {path}.prof and {path}.txt")
+
+    def toggle_profile(self) -> None:
+        if self.profiler is None:
+            self.start_profile(duration=settings.PROFILE_DURATION)
+        else:
+            self.stop_profile()
+
+    def start(self, profile_duration: float | None = None) -> None:
+        if not self.tasks:
+            if settings.SLOW_CALLBACK_DURATION > 0:
+                if type(asyncio.get_running_loop()).__module__.startswith('asyncio'):
+                    self.install_slow_callback_hook()
+                else:
+                    logger.warning("Slow callback reporting is only available with the default event loop")
+
+            self.tasks.append(asyncio.create_task(self.sample_lag()))
+
+            if settings.LOOP_REPORT_INTERVAL > 0:
+                self.tasks.append(asyncio.create_task(self.report()))
+
+            if hasattr(signal, 'SIGUSR1'):
+                asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, self.toggle_profile)
+
+        if profile_duration:
+            self.start_profile(duration=profile_duration)
+
+    def stop(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+
+        self.tasks.clear()
+        self.stop_profile()
+
+        if hasattr(signal, 'SIGUSR1'):
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR1)
+
+
+loop_monitor = LoopMonitor()
@@ -0,0 +1,140 @@
+import asyncio
+from collections import defaultdict
+
+from aiohttp import web
+
+from bot.config import settings
+from bot.utils import logger
+
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    return ','.join(f'{name}="{value}"' for name, value in labels)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.total += value
+        self.count += 1
+
+        for index, bucket in enumerate(self.buckets):
+            if value <= bucket:
+                self.counts[index] += 1
+                break
+
+    def render(self, name: str, labels: tuple[tuple[str, str], ...]) -> list[str]:
+        lines = []
+        cumulative = 0
+
+        for bucket, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{format_labels(labels + (("le", str(bucket)),))}}} {cumulative}')
+
+        lines.append(f'{name}_bucket{{{format_labels(labels + (("le", "+Inf"),))}}} {self.count}')
+        lines.append(f'{name}_sum{{{format_labels(labels)}}} {self.total}')
+        lines.append(f'{name}_count{{{format_labels(labels)}}} {self.count}')
+
+        return lines
+
+
+class Metrics:
+    def __init__(self):
+        self.latencies: dict[tuple, Histogram] = defaultdict(Histogram)
+        self.responses: dict[tuple, int] = defaultdict(int)
+        self.errors: dict[tuple, int] = defaultdict(int)
+        self.retries: dict[tuple, int] = defaultdict(int)
+        self.slow_callbacks: dict[tuple, int] = defaultdict(int)
+        self.gauges: dict[str, dict[tuple, float]] = defaultdict(dict)
+        self.accounts: dict[str, dict[str, float]] = defaultdict(dict)
+
+    def observe_request(self, endpoint: str, proxy: str, status: int, latency: float) -> None:
+        self.latencies[(('endpoint', endpoint), ('proxy', proxy))].observe(latency)
+        self.responses[(('endpoint', endpoint), ('proxy', proxy), ('status', str(status)))] += 1
+
+    def record_error(self, endpoint: str, proxy: str, kind: str) -> None:
+        self.errors[(('endpoint', endpoint), ('proxy', proxy), ('kind', kind))] += 1
+
+    def record_retry(self, endpoint: str, proxy: str) -> None:
+        self.retries[(('endpoint', endpoint), ('proxy', proxy))] += 1
+
+    def record_slow_callback(self, callback: str) -> None:
+        self.slow_callbacks[(('callback', callback),)] += 1
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        self.gauges[name][tuple(labels.items())] = value
+
+    def clear_gauge(self, name: str) -> None:
+        self.gauges.pop(name, None)
+
+    def set_account(self, session_name: str, **values: float) -> None:
+        self.accounts[session_name].update(values)
+
+    def remove_account(self, session_name: str) -> None:
+        self.accounts.pop(session_name, None)
+
+    def render(self) -> str:
+        lines = ['# TYPE wormslap_request_duration_seconds histogram']
+        for labels, histogram in self.latencies.items():
+            lines.extend(histogram.render(name='wormslap_request_duration_seconds', labels=labels))
+
+        for name, counters in (('wormslap_responses_total', self.responses),
+                               ('wormslap_errors_total', self.errors),
+                               ('wormslap_retries_total', self.retries),
+                               ('wormslap_slow_callbacks_total', self.slow_callbacks)):
+            lines.append(f'# TYPE {name} counter')
+            lines.extend(f'{name}{{{format_labels(labels)}}} {value}' for labels, value in counters.items())
+
+        for name, values in self.gauges.items():
+            lines.append(f'# TYPE {name} gauge')
+            lines.extend(f'{name}{{{format_labels(labels)}}} {value}' if labels else f'{name} {value}'
+                         for labels, value in values.items())
+
+        gauges: dict[str, list[str]] = defaultdict(list)
+        for session_name, values in self.accounts.items():
+            for name, value in values.items():
+                gauges[name].append(f'wormslap_account_{name}{{session="{session_name}"}} {value}')
+
+        for name, gauge_lines in gauges.items():
+            lines.append(f'# TYPE wormslap_account_{name} gauge')
+            lines.extend(gauge_lines)
+
+        return '\n'.join(lines) + '\n'
+
+    async def handle(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.render(), content_type='text/plain')
+
+    async def serve(self, port: int) -> None:
+        app = web.Application()
+        app.router.add_get('/metrics', self.handle)
+
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host=settings.METRICS_HOST, port=port).start()
+
+        logger.info(f"Metrics available at http://{settings.METRICS_HOST}:{port}/metrics")
+
+    async def dump(self, path: str) -> None:
+        while True:
+            await asyncio.sleep(delay=settings.METRICS_INTERVAL)
+
+            with open(file=path, mode='w', encoding='utf-8') as file:
+                file.write(self.render())
+
+    async def start(self, worker_index: int | None = None) -> None:
+        if settings.METRICS_PORT:
+            await self.serve(port=settings.METRICS_PORT + (worker_index or 0))
+
+        if settings.METRICS_FILE:
+            path = settings.METRICS_FILE if worker_index is None else f'{settings.METRICS_FILE}.{worker_index}'
+            asyncio.create_task(self.dump(path=path))
+
+
+metrics = Metrics()
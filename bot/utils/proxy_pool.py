@@ -0,0 +1,170 @@
+import asyncio
+from time import perf_counter
+
+import aiohttp
+
+from bot.config import settings
+from bot.utils import logger
+from bot.core.http_pool import http_pool
+
+
+class ProxyHealth:
+    def __init__(self):
+        self.alive = True
+        self.latency: float | None = None
+        self.error_rate = 0.0
+        self.sessions: set[str] = set()
+
+    @property
+    def score(self) -> float:
+        if not self.alive:
+            return float('inf')
+
+        return (self.latency or settings.PROXY_MAX_LATENCY) * (1 + 10 * self.error_rate)
+
+    @property
+    def is_healthy(self) -> bool:
+        return (self.alive
+                and self.error_rate <= settings.PROXY_MAX_ERROR_RATE
+                and (self.latency is None or self.latency <= settings.PROXY_MAX_LATENCY))
+
+
+class ProxyPool:
+    def __init__(self):
+        self.proxies: dict[str, ProxyHealth] = {}
+        self.assignments: dict[str, str] = {}
+        self.check_task: asyncio.Task | None = None
+
+    def add(self, proxies: list[str]) -> None:
+        for proxy in proxies:
+            self.proxies.setdefault(proxy, ProxyHealth())
+
+    def remove(self, proxies: list[str]) -> None:
+        for proxy in proxies:
+            health = self.proxies.pop(proxy, None)
+
+            if health is None:
+                continue
+
+            for session_name in health.sessions:
+                self.assignments.pop(session_name, None)
+
+    async def check(self, proxy: str) -> None:
+        health = self.proxies.get(proxy)
+
+        if health is None:
+            return
+
+        started_at = perf_counter()
+
+        try:
+            http_client = http_pool.get_session(proxy=proxy)
+            response = await http_client.get(url=settings.PROXY_CHECK_URL,
+                                             timeout=aiohttp.ClientTimeout(settings.PROXY_CHECK_TIMEOUT))
+            response.raise_for_status()
+            await response.read()
+
+            latency = perf_counter() - started_at
+            health.latency = latency if health.latency is None else health.latency * 0.7 + latency * 0.3
+            health.error_rate /= 2
+            health.alive = True
+        except Exception as error:
+            if health.alive:
+                logger.warning(f"Proxy: {proxy} | Health check failed: {error}")
+
+            health.alive = False
+
+    async def check_all(self, proxies: list[str] | None = None) -> None:
+        proxies = list(self.proxies) if proxies is None else proxies
+        semaphore = asyncio.Semaphore(value=settings.PROXY_CHECK_CONCURRENCY)
+
+        async def check(proxy: str) -> None:
+            async with semaphore:
+                await self.check(proxy=proxy)
+
+        await asyncio.gather(*(check(proxy) for proxy in proxies))
+
+        alive = sum(self.proxies[proxy].alive for proxy in proxies if proxy in self.proxies)
+        logger.info(f"Proxies checked | Alive: <g>{alive}</g>/{len(proxies)}")
+
+    async def run_checks(self) -> None:
+        while True:
+            await asyncio.sleep(delay=settings.PROXY_CHECK_INTERVAL)
+            await self.check_all()
+
+    async def start(self, proxies: list[str]) -> None:
+        self.add(proxies=proxies)
+
+        if not self.proxies:
+            return
+
+        await self.check_all()
+
+        if self.check_task is None:
+            self.check_task = asyncio.create_task(self.run_checks())
+
+    async def reload(self, added: list[str], removed: list[str]) -> None:
+        self.remove(proxies=removed)
+        self.add(proxies=added)
+
+        if removed:
+            logger.info(f"Removed {len(removed)} proxies from the pool")
+
+        if added:
+            await self.check_all(proxies=added)
+
+        if self.proxies and self.check_task is None:
+            self.check_task = asyncio.create_task(self.run_checks())
+
+    def stop(self) -> None:
+        if self.check_task is not None:
+            self.check_task.cancel()
+            self.check_task = None
+
+    def record_success(self, proxy: str | None) -> None:
+        if proxy in self.proxies:
+            self.proxies[proxy].error_rate *= 0.9
+
+    def record_failure(self, proxy: str | None) -> None:
+        if proxy in self.proxies:
+            health = self.proxies[proxy]
+            health.error_rate = health.error_rate * 0.9 + 0.1
+
+    def is_healthy(self, proxy: str | None) -> bool:
+        if proxy in self.proxies:
+            return self.proxies[proxy].is_healthy
+
+        return not self.proxies
+
+    def release(self, session_name: str) -> None:
+        proxy = self.assignments.pop(session_name, None)
+
+        if proxy in self.proxies:
+            self.proxies[proxy].sessions.discard(session_name)
+
+    def assign(self, session_name: str, preferred: str | None = None) -> str | None:
+        if not self.proxies:
+            return preferred
+
+        self.release(session_name=session_name)
+
+        candidates = [proxy for proxy, health in self.proxies.items()
+                      if health.is_healthy and len(health.sessions) < settings.PROXY_MAX_ACCOUNTS]
+
+        if preferred in candidates:
+            proxy = preferred
+        elif candidates:
+            proxy = min(candidates, key=lambda candidate: (self.proxies[candidate].score,
+                                                           len(self.proxies[candidate].sessions)))
+        elif preferred in self.proxies:
+            proxy = preferred
+        else:
+            proxy = min(self.proxies, key=lambda candidate: self.proxies[candidate].score)
+
+        self.proxies[proxy].sessions.add(session_name)
+        self.assignments[session_name] = proxy
+
+        return proxy
+
+
+proxy_pool = ProxyPool()
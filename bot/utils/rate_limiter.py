@@ -0,0 +1,66 @@
+import asyncio
+from time import monotonic
+
+from bot.config import settings
+
+
+class TokenBucket:
+    __slots__ = ('rate', 'share', 'tokens', 'updated_at', 'decreased_at', 'slow_start', 'lock')
+
+    def __init__(self, rate: float, share: float = 1):
+        self.rate = rate * share
+        self.share = share
+        self.tokens = float(settings.RATE_LIMIT_BURST)
+        self.updated_at = monotonic()
+        self.decreased_at = 0
+        self.slow_start = True
+        self.lock = asyncio.Lock()
+
+    def refill(self) -> None:
+        now = monotonic()
+        self.tokens = min(self.tokens + (now - self.updated_at) * self.rate, settings.RATE_LIMIT_BURST)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            self.refill()
+
+            while self.tokens < 1:
+                await asyncio.sleep(delay=(1 - self.tokens) / self.rate)
+                self.refill()
+
+            self.tokens -= 1
+
+    def record_success(self) -> None:
+        if self.tokens >= 1:
+            return
+
+        increase = 1 if self.slow_start else settings.RATE_LIMIT_INCREASE / self.rate
+        self.rate = min(self.rate + increase, settings.RATE_LIMIT_MAX * self.share)
+
+    def record_throttle(self, retry_after: float | None = None) -> None:
+        now = monotonic()
+
+        if now - self.decreased_at < 1:
+            return
+
+        self.refill()
+        self.decreased_at = now
+        self.slow_start = False
+        self.rate = max(self.rate * settings.RATE_LIMIT_DECREASE, settings.RATE_LIMIT_MIN * self.share)
+        self.tokens = min(self.tokens, -(retry_after or 0) * self.rate)
+
+
+class RateLimiters:
+    def __init__(self):
+        self.buckets: dict[str, TokenBucket] = {}
+        self.share = 1
+
+    def get(self, proxy: str) -> TokenBucket:
+        if proxy not in self.buckets:
+            self.buckets[proxy] = TokenBucket(rate=settings.RATE_LIMIT_INITIAL, share=self.share)
+
+        return self.buckets[proxy]
+
+
+rate_limiters = RateLimiters()
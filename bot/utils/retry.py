@@ -0,0 +1,146 @@
+import asyncio
+from enum import Enum
+from time import time
+from random import uniform
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+from aiohttp_proxy.errors import ProxyError, SocksError
+
+from bot.config import settings
+
+
+class ErrorKind(str, Enum):
+    TIMEOUT = "timeout"
+    RATE_LIMIT = "rate_limit"
+    SERVER = "server"
+    UNAUTHORIZED = "unauthorized"
+    PROXY = "proxy"
+    CLIENT = "client"
+    UNKNOWN = "unknown"
+
+
+PROBE_DELAY = 5
+
+RETRYABLE_KINDS = {ErrorKind.TIMEOUT, ErrorKind.RATE_LIMIT, ErrorKind.SERVER, ErrorKind.PROXY}
+PROXY_FAILURE_KINDS = {ErrorKind.TIMEOUT, ErrorKind.PROXY}
+
+
+def classify_error(error: BaseException) -> ErrorKind:
+    if isinstance(error, asyncio.TimeoutError):
+        return ErrorKind.TIMEOUT
+
+    if isinstance(error, aiohttp.ClientResponseError):
+        if error.status == 401:
+            return ErrorKind.UNAUTHORIZED
+        if error.status == 429:
+            return ErrorKind.RATE_LIMIT
+        if error.status >= 500:
+            return ErrorKind.SERVER
+
+        return ErrorKind.CLIENT
+
+    if isinstance(error, (ProxyError, SocksError, aiohttp.ClientConnectionError, ConnectionError)):
+        return ErrorKind.PROXY
+
+    return ErrorKind.UNKNOWN
+
+
+def get_retry_after(error: BaseException) -> float | None:
+    if not isinstance(error, aiohttp.ClientResponseError) or not error.headers:
+        return None
+
+    retry_after = error.headers.get('Retry-After')
+
+    if not retry_after:
+        return None
+
+    if retry_after.isdigit():
+        return float(retry_after)
+
+    try:
+        return max(parsedate_to_datetime(retry_after).timestamp() - time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    def __init__(self, attempts: int, base_delay: float, max_delay: float):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def get_delay(self, attempt: int, error: BaseException | None = None) -> float:
+        retry_after = get_retry_after(error) if error else None
+
+        if retry_after is not None:
+            return min(retry_after, self.max_delay) + uniform(0, self.base_delay)
+
+        delay = min(self.base_delay * 2 ** attempt, self.max_delay)
+
+        return uniform(delay / 2, delay)
+
+
+class CircuitBreaker:
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = 0
+        self.probing = False
+
+    @property
+    def threshold(self) -> int:
+        return settings.CIRCUIT_BREAKER_THRESHOLD
+
+    @property
+    def cooldown(self) -> float:
+        return settings.CIRCUIT_BREAKER_COOLDOWN
+
+    @property
+    def is_open(self) -> bool:
+        return self.failures >= self.threshold
+
+    @property
+    def retry_after(self) -> float:
+        retry_after = max(self.opened_at + self.cooldown - time(), 0)
+
+        return max(retry_after, PROBE_DELAY) if self.probing else retry_after
+
+    def allow(self) -> bool:
+        if not self.is_open:
+            return True
+
+        if self.retry_after > 0 or self.probing:
+            return False
+
+        self.probing = True
+        return True
+
+    def cancel_probe(self) -> None:
+        self.probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.probing = False
+
+        if self.failures >= self.threshold:
+            self.opened_at = time()
+
+
+class CircuitBreakers:
+    def __init__(self):
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, proxy: str) -> CircuitBreaker:
+        if proxy not in self.breakers:
+            self.breakers[proxy] = CircuitBreaker()
+
+        return self.breakers[proxy]
+
+
+retry_policy = RetryPolicy(attempts=settings.RETRY_ATTEMPTS, base_delay=settings.RETRY_BASE_DELAY,
+                           max_delay=settings.RETRY_MAX_DELAY)
+circuit_breakers = CircuitBreakers()
@@ -0,0 +1,100 @@
+import sqlite3
+from pathlib import Path
+
+from pyrogram.storage import FileStorage, MemoryStorage
+
+from bot.config import settings
+from bot.utils import logger
+
+
+class SessionStore:
+    def __init__(self, path: str, workdir: str):
+        self.path = path
+        self.workdir = workdir
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(database=self.path, timeout=30, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_name TEXT PRIMARY KEY,
+                    session_string TEXT NOT NULL
+                )
+            """)
+
+        return self._connection
+
+    def get_session_names(self) -> list[str]:
+        return [row[0] for row in self.connection.execute("SELECT session_name FROM sessions")]
+
+    def load(self) -> dict[str, str]:
+        return dict(self.connection.execute("SELECT session_name, session_string FROM sessions").fetchall())
+
+    async def export_session_string(self, session_name: str) -> str | None:
+        storage = FileStorage(name=session_name, workdir=Path(self.workdir))
+        await storage.open()
+
+        try:
+            if await storage.auth_key() is None or await storage.user_id() is None:
+                return None
+
+            if await storage.api_id() is None:
+                await storage.api_id(settings.API_ID)
+
+            return await storage.export_session_string()
+        finally:
+            await storage.close()
+
+    async def save_session_string(self, session_name: str, session_string: str) -> None:
+        if settings.USE_SESSION_STORE:
+            self.connection.execute("INSERT OR REPLACE INTO sessions (session_name, session_string) VALUES (?, ?)",
+                                    (session_name, session_string))
+            return
+
+        source = MemoryStorage(name=session_name, session_string=session_string)
+        storage = FileStorage(name=session_name, workdir=Path(self.workdir))
+        await source.open()
+        await storage.open()
+
+        try:
+            await storage.dc_id(await source.dc_id())
+            await storage.api_id(await source.api_id() or settings.API_ID)
+            await storage.test_mode(await source.test_mode())
+            await storage.auth_key(await source.auth_key())
+            await storage.user_id(await source.user_id())
+            await storage.is_bot(await source.is_bot())
+            await storage.date(0)
+        finally:
+            await storage.close()
+            await source.close()
+
+    async def sync(self, session_names: list[str]) -> None:
+        stored_session_names = set(self.get_session_names())
+        rows = []
+
+        for session_name in session_names:
+            if session_name in stored_session_names:
+                continue
+
+            try:
+                session_string = await self.export_session_string(session_name=session_name)
+            except Exception as error:
+                logger.warning(f"{session_name} | Failed to import session: {error}")
+                continue
+
+            if session_string is None:
+                logger.warning(f"{session_name} | Session is not authorized, skipped")
+                continue
+
+            rows.append((session_name, session_string))
+
+        if rows:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO sessions (session_name, session_string) VALUES (?, ?)", rows)
+            logger.info(f"Imported {len(rows)} sessions into the session store")
+
+
+session_store = SessionStore(path='sessions/sessions.db', workdir='sessions/')
@@ -0,0 +1,134 @@
+import asyncio
+import sqlite3
+from time import time
+
+from bot.config import settings
+from bot.utils import logger
+
+
+COLUMNS = ('session_name', 'timestamp', 'balance', 'total_earned', 'energy', 'rank', 'earned_today', 'earned_week',
+           'slap_level', 'energy_level', 'charge_level')
+
+
+class StatsStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+
+        self.buffer: list[tuple] = []
+        self.recorded_at: dict[str, float] = {}
+        self.flush_task: asyncio.Task | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(database=self.path, timeout=30, isolation_level=None,
+                                               check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS samples (
+                    session_name TEXT NOT NULL,
+                    timestamp REAL NOT NULL,
+                    balance INTEGER,
+                    total_earned INTEGER,
+                    energy INTEGER,
+                    rank INTEGER,
+                    earned_today INTEGER,
+                    earned_week INTEGER,
+                    slap_level INTEGER,
+                    energy_level INTEGER,
+                    charge_level INTEGER
+                )
+            """)
+            self._connection.execute("""
+                CREATE INDEX IF NOT EXISTS samples_timestamp
+                ON samples (timestamp, session_name, total_earned, balance, rank)
+            """)
+
+        return self._connection
+
+    def record(self, session_name: str, **values: int | None) -> None:
+        if not settings.USE_STATS_STORE:
+            return
+
+        now = time()
+
+        if now - self.recorded_at.get(session_name, 0) < settings.STATS_INTERVAL:
+            return
+
+        self.recorded_at[session_name] = now
+        self.buffer.append((session_name, now, *(values.get(column) for column in COLUMNS[2:])))
+
+    def write(self, rows: list[tuple]) -> None:
+        with self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                f"INSERT INTO samples ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})", rows)
+
+    async def flush(self) -> None:
+        if not self.buffer:
+            return
+
+        rows, self.buffer = self.buffer, []
+
+        try:
+            await asyncio.to_thread(self.write, rows)
+        except sqlite3.Error as error:
+            logger.warning(f"Failed to write {len(rows)} stats samples: {error}")
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(delay=settings.STATS_FLUSH_INTERVAL)
+            await self.flush()
+
+    def start(self) -> None:
+        if settings.USE_STATS_STORE and self.flush_task is None:
+            self.flush_task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            self.flush_task = None
+
+        await self.flush()
+
+    def get_rates(self, window: int) -> dict[str, float]:
+        rows = self.connection.execute("""
+            SELECT session_name, MAX(timestamp) - MIN(timestamp), MAX(total_earned) - MIN(total_earned)
+            FROM samples
+            WHERE timestamp >= ? AND total_earned IS NOT NULL
+            GROUP BY session_name
+        """, (time() - window * 3600,)).fetchall()
+
+        return {session_name: earned / span * 3600 for session_name, span, earned in rows if span > 0}
+
+    def get_latest(self, window: int) -> dict[str, tuple[int | None, int | None]]:
+        rows = self.connection.execute("""
+            SELECT session_name, balance, rank, MAX(timestamp)
+            FROM samples
+            WHERE timestamp >= ?
+            GROUP BY session_name
+        """, (time() - window * 3600,)).fetchall()
+
+        return {session_name: (balance, rank) for session_name, balance, rank, _ in rows}
+
+    def report(self, windows: list[int]) -> None:
+        latest = self.get_latest(window=max(windows))
+
+        if not latest:
+            logger.warning(f"No stats recorded in the last {max(windows)}h")
+            return
+
+        rates = {window: self.get_rates(window=window) for window in windows}
+
+        for session_name, (balance, rank) in sorted(latest.items()):
+            earnings = ' | '.join(f"{window}h: <g>+{rates[window].get(session_name, 0):.0f}</g>/h"
+                                  for window in windows)
+            logger.info(f"{session_name} | Balance: <c>{balance}</c> | Rank: <m>{rank}</m> | {earnings}")
+
+        earnings = ' | '.join(f"{window}h: <g>+{sum(rates[window].values()):.0f}</g>/h" for window in windows)
+        logger.info(f"Fleet | Accounts: <c>{len(latest)}</c> | {earnings}")
+
+
+stats_store = StatsStore(path='sessions/stats.db')